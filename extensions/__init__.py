@@ -0,0 +1 @@
+"""Jinja extensions the template loads through copier-template-extensions."""
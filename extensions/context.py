@@ -0,0 +1,334 @@
+"""
+Template context computed in Python instead of in copier.yaml.
+
+TOOLS and SCRIPTS are the single registry of the tools a generated project
+depends on and the tasks it defines. For each set of answers, TemplateContext
+selects the entries that apply and adds them to the rendering context as
+`project_tools`, `dev_tools`, `doc_tools` (lists of Tool) and `scripts` (a dict
+of Script by task name). Templates read their attributes directly, so nothing
+is serialized to JSON and parsed again in each file.
+
+The selected tools also determine which pre-resolved pdm.lock from
+template/locks/ the project gets as `pre_resolved_lock` (empty when there is
+none yet); scripts/update_locks.py regenerates those locks.
+
+Loaded through copier-template-extensions, see `_jinja_extensions` in
+copier.yaml.
+"""
+
+import hashlib
+import json
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from copier_template_extensions import ContextHook
+
+Answers = Mapping[str, Any]
+Condition = Callable[[Answers], bool]
+
+# Every answer a condition below reads. The selection is cached on these, so
+# adding a condition on another answer means adding the answer here too.
+CONTEXT_INPUTS = (
+    "cli",
+    "config_library",
+    "use_safety",
+    "use_bandit",
+    "use_semantic_release",
+    "use_docs",
+    "use_mkdocstrings",
+    "doc_hosting_provider",
+    "include_adr",
+    "use_benchmarks",
+    "installer",
+    "python_version",
+)
+
+# Pre-resolved locks, one per distinct dependency profile. The directory is in
+# the template's subdirectory but excluded from rendering (see copier.yaml).
+LOCK_DIR = Path(__file__).resolve().parent.parent / "template" / "locks"
+
+
+def always(answers: Answers) -> bool:
+    return True
+
+
+@dataclass(frozen=True)
+class Tool:
+    """A dependency of the generated project."""
+
+    name: str
+    desc: str
+    # Which of project_tools, dev_tools and doc_tools the tool belongs to.
+    groups: frozenset[str]
+    when: Condition = always
+
+
+@dataclass(frozen=True)
+class Script:
+    """A task for the project's task runner (pdm scripts or a justfile recipe)."""
+
+    name: str
+    help: str
+    cmd: str = ""
+    composite: tuple[str, ...] = ()
+    # Whether the composite `qa` task runs this one.
+    qa: bool = False
+    when: Condition = always
+
+
+PROJECT, DEV, DOCS = "project", "dev", "docs"
+
+TOOLS: tuple[Tool, ...] = (
+    Tool(
+        "typed-settings",
+        "Alternative to pydantic-settings for managing application settings.",
+        frozenset({PROJECT}),
+        lambda a: a["config_library"] == "typed-settings",
+    ),
+    Tool(
+        "attrs",
+        "Defines the typed-settings Settings class.",
+        frozenset({PROJECT}),
+        lambda a: a["config_library"] == "typed-settings",
+    ),
+    Tool(
+        "python-dotenv",
+        "Lets typed-settings read the .env file.",
+        frozenset({PROJECT}),
+        lambda a: a["config_library"] == "typed-settings",
+    ),
+    Tool(
+        "pydantic-settings",
+        "For managing application settings via environment variables.",
+        frozenset({PROJECT}),
+        lambda a: a["config_library"] == "pydantic-settings",
+    ),
+    Tool("pytest", "For running the test suite.", frozenset({DEV})),
+    Tool("pytest-cov", "For measuring test coverage.", frozenset({DEV})),
+    Tool("pytest-xdist", "For running tests in parallel.", frozenset({DEV})),
+    Tool(
+        "pytest-benchmark",
+        "For benchmarking code with pytest.",
+        frozenset({DEV}),
+        lambda a: a["use_benchmarks"],
+    ),
+    Tool("ruff", "All-in-one linter, formatter, and import sorter.", frozenset({DEV})),
+    Tool(
+        "commitizen",
+        "For standardized, conventional commit messages.",
+        frozenset({DEV}),
+    ),
+    Tool("mypy", "For static type checking.", frozenset({DEV})),
+    Tool(
+        "typer[all]",
+        "For building a CLI (if included).",
+        frozenset({PROJECT, DEV}),
+        lambda a: a["cli"],
+    ),
+    Tool(
+        "rich",
+        "For rich text and formatting in the CLI (if included).",
+        frozenset({PROJECT, DEV}),
+        lambda a: a["cli"],
+    ),
+    Tool(
+        "safety",
+        "For checking dependencies against known security vulnerabilities.",
+        frozenset({DEV}),
+        lambda a: a["use_safety"],
+    ),
+    Tool(
+        "bandit",
+        "For finding common security issues in code.",
+        frozenset({DEV}),
+        lambda a: a["use_bandit"],
+    ),
+    Tool(
+        "python-semantic-release",
+        "For automated versioning, changelog generation, and releases (used in CI).",
+        frozenset({DEV}),
+        lambda a: a["use_semantic_release"],
+    ),
+    Tool(
+        "mkdocs",
+        "A static site generator for project documentation.",
+        frozenset({DOCS}),
+        lambda a: a["use_docs"],
+    ),
+    Tool(
+        "mkdocs-material",
+        "Theme for MkDocs.",
+        frozenset({DOCS}),
+        lambda a: a["use_docs"],
+    ),
+    Tool(
+        "mkdocstrings[python]",
+        "For automatically generating API documentation from docstrings.",
+        frozenset({DOCS}),
+        lambda a: a["use_docs"] and a["use_mkdocstrings"],
+    ),
+)
+
+SCRIPTS: tuple[Script, ...] = (
+    Script(
+        "format-check",
+        "Check if code formatting is correct (Ruff).",
+        cmd="ruff format . --diff",
+        qa=True,
+    ),
+    Script("format", "Apply code formatting (Ruff).", cmd="ruff format ."),
+    Script(
+        "lint",
+        "Run the linter and import sorter (Ruff).",
+        cmd="ruff check . --fix",
+        qa=True,
+    ),
+    Script("type-check", "Run static type checking (MyPy).", cmd="mypy .", qa=True),
+    Script("test", "Run the test suite (pytest).", cmd="pytest", qa=True),
+    Script(
+        "test-fast",
+        "Run the tests in parallel without coverage, skipping slow ones.",
+        cmd="pytest -n auto --no-cov -m 'not slow and not integration and not network'",
+    ),
+    Script(
+        "test-full",
+        "Run every test in parallel, with coverage.",
+        cmd="pytest -n auto",
+    ),
+    Script(
+        "bench",
+        "Run the benchmarks (pytest-benchmark).",
+        cmd="pytest tests/benchmarks --benchmark-enable --benchmark-only --no-cov",
+        when=lambda a: a["use_benchmarks"],
+    ),
+    Script(
+        "bench-compare",
+        "Run the benchmarks and fail on regressions from the saved baseline.",
+        cmd="python scripts/bench_compare.py",
+        when=lambda a: a["use_benchmarks"],
+    ),
+    Script("deploy", "Placeholder for deployment tasks.", cmd="echo 'Deploying...'"),
+    Script(
+        "safety-check",
+        "Check for known security vulnerabilities in dependencies.",
+        cmd="safety check",
+        qa=True,
+        when=lambda a: a["use_safety"],
+    ),
+    Script(
+        "bandit-check",
+        "Run Bandit security linter.",
+        cmd="bandit -r src",
+        qa=True,
+        when=lambda a: a["use_bandit"],
+    ),
+    Script(
+        "export-docs-reqs",
+        "Export documentation dependencies for Read the Docs.",
+        cmd="pdm export --group docs --without-hashes -o docs-requirements.txt",
+        when=lambda a: (
+            a["doc_hosting_provider"] == "Read the Docs" and a["installer"] != "uv"
+        ),
+    ),
+    Script(
+        "export-docs-reqs",
+        "Export documentation dependencies for Read the Docs.",
+        cmd="uv export --no-dev --group docs --no-hashes --no-emit-project"
+        " -o docs-requirements.txt",
+        when=lambda a: (
+            a["doc_hosting_provider"] == "Read the Docs" and a["installer"] == "uv"
+        ),
+    ),
+    Script(
+        "adr",
+        "Create a new Architecture Decision Record.",
+        cmd="python scripts/new_adr.py",
+        when=lambda a: a["include_adr"],
+    ),
+)
+
+
+def select_tools(answers: Answers, group: str) -> list[Tool]:
+    """The registered tools in `group` that apply to these answers, in order."""
+    return [tool for tool in TOOLS if group in tool.groups and tool.when(answers)]
+
+
+def select_scripts(answers: Answers) -> dict[str, Script]:
+    """The tasks that apply to these answers, followed by the composite `qa` task."""
+    scripts = {script.name: script for script in SCRIPTS if script.when(answers)}
+    scripts["qa"] = Script(
+        "qa",
+        "Run the full quality assurance suite.",
+        composite=tuple(name for name, script in scripts.items() if script.qa),
+    )
+    return scripts
+
+
+def dependency_profile(answers: Answers) -> dict[str, Any]:
+    """
+    Everything a pdm.lock for these answers is resolved from.
+
+    These are the dependency sections of the rendered pyproject.toml, so two
+    projects with the same profile can share one lock.
+    """
+    names = {
+        group: [tool.name for tool in select_tools(answers, group)]
+        for group in (PROJECT, DEV, DOCS)
+    }
+    return {
+        "requires-python": f">={answers.get('python_version')}",
+        "dependencies": names[PROJECT],
+        "optional-dependencies": {"docs": names[DOCS]},
+        "dev-dependencies": {"dev": names[DEV], "docs": names[DOCS]},
+    }
+
+
+def lock_key(profile: Mapping[str, Any]) -> str:
+    """A stable name for a dependency profile's lock."""
+    normalized = json.dumps(profile, sort_keys=True)
+    return hashlib.sha256(normalized.encode()).hexdigest()[:16]
+
+
+def lock_path(answers: Answers) -> Path:
+    return LOCK_DIR / f"{lock_key(dependency_profile(answers))}.pdm.lock"
+
+
+def pre_resolved_lock(answers: Answers) -> str:
+    """The shipped pdm.lock for these answers, or "" when there is none."""
+    # uv projects lock into uv.lock, which records the project's own name.
+    if answers.get("installer") == "uv":
+        return ""
+    path = lock_path(answers)
+    return path.read_text(encoding="utf-8") if path.is_file() else ""
+
+
+@lru_cache
+def _build(inputs: tuple[tuple[str, Any], ...]) -> dict[str, Any]:
+    answers = dict(inputs)
+    return {
+        "project_tools": select_tools(answers, PROJECT),
+        "dev_tools": select_tools(answers, DEV),
+        "doc_tools": select_tools(answers, DOCS),
+        "scripts": select_scripts(answers),
+        "pre_resolved_lock": pre_resolved_lock(answers),
+    }
+
+
+def build_context(answers: Answers) -> dict[str, Any]:
+    """
+    Compute the tool lists, the script table and the lock for a set of answers.
+
+    Copier renders every file (and file name) with a fresh context, so the result
+    is cached on the answers it depends on and built once per project.
+    """
+    return _build(tuple((name, answers.get(name)) for name in CONTEXT_INPUTS))
+
+
+class TemplateContext(ContextHook):
+    """Add the tool lists, the script table and the lock to the rendering context."""
+
+    def hook(self, context: dict[str, Any]) -> None:
+        context.update(build_context(context))
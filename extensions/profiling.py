@@ -0,0 +1,279 @@
+"""
+Opt-in profiling of template rendering.
+
+Set COPIER_PROFILE to a directory to enable it:
+
+    COPIER_PROFILE=profiles copier copy --trust . ../my-project
+
+Every Jinja render copier performs is then timed: question defaults, `when`
+conditions and validators ("questions"), `_exclude` and `_skip_if_exists`
+patterns ("exclude", "skip"), file names ("paths"), file contents ("files") and
+task commands ("tasks"). Compiling a template counts towards its render. Each
+copier run writes a report to the directory in two formats: `render-*.json` with
+per-phase and per-file timings, slowest first, and `render-*.trace.json` in
+Chrome trace format (chrome://tracing, Perfetto). Both are written once, when
+the copier run ends (its Worker is released) or at exit, so writing them is not
+part of what they measure.
+
+The absolute directory is also the `copier_profile_dir` Jinja global, which the
+bootstrap.py task in copier.yaml passes on as --profile-dir, so bootstrap.py
+writes its own `bootstrap-*.json` report next to these.
+
+Phases, and the Worker a run belongs to, are found by walking the stack to
+copier's own functions (see PHASE_BY_FUNCTION, _phase and _copier_worker), which
+are private. If a copier release renames them, renders are reported under
+"other" with a warning, the report is written at exit, and
+tests/test_render_profiling.py fails.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import warnings
+import weakref
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from jinja2 import Environment, Template
+from jinja2.ext import Extension
+
+ENV_VAR = "COPIER_PROFILE"
+
+# Copier functions that identify a render's phase, checked innermost first.
+# These are private to copier; renders outside all of them count as "other".
+PHASE_BY_FUNCTION = {
+    "match_exclude": "exclude",
+    "match_skip": "skip",
+    "_render_path": "paths",
+    "_render_file": "files",
+    "_execute_tasks": "tasks",
+}
+
+
+@dataclass
+class Timing:
+    """One timed render."""
+
+    name: str
+    phase: str
+    start: float
+    seconds: float
+    thread: int
+
+
+def _phase(frame: FrameType | None) -> tuple[str, str | None]:
+    """Find the copier phase a render belongs to, and the question if any."""
+    while frame is not None:
+        function = frame.f_code.co_name
+        if function in PHASE_BY_FUNCTION:
+            return PHASE_BY_FUNCTION[function], None
+        if frame.f_code.co_filename.endswith("_user_data.py"):
+            question = getattr(frame.f_locals.get("self"), "var_name", None)
+            return "questions", question
+        frame = frame.f_back
+    return "other", None
+
+
+def _warn_no_phases() -> None:
+    # A RuntimeWarning from one place is shown once per process by default.
+    warnings.warn(
+        "No render matched a copier phase, so all are reported as 'other': "
+        "this copier version may have renamed the functions in "
+        "PHASE_BY_FUNCTION (extensions/profiling.py).",
+        RuntimeWarning,
+        stacklevel=2,
+    )
+
+
+def _copier_worker() -> Any:
+    """The copier Worker whose `jinja_env` is being built, or None."""
+    frame: FrameType | None = sys._getframe(1)
+    while frame is not None:
+        if frame.f_code.co_name == "jinja_env":
+            return frame.f_locals.get("self")
+        frame = frame.f_back
+    return None
+
+
+def build_report(
+    kind: str, timings: Iterable[Timing], total_seconds: float
+) -> dict[str, Any]:
+    """Summarize timings per phase and per item, slowest first."""
+    timings = list(timings)
+    phases: dict[str, list[float]] = defaultdict(list)
+    items: dict[tuple[str, str], float] = defaultdict(float)
+    for timing in timings:
+        phases[timing.phase].append(timing.seconds)
+        items[timing.phase, timing.name] += timing.seconds
+    return {
+        "kind": kind,
+        "total_seconds": round(total_seconds, 6),
+        "phases": sorted(
+            (
+                {"phase": phase, "seconds": round(sum(times), 6), "count": len(times)}
+                for phase, times in phases.items()
+            ),
+            key=lambda entry: entry["seconds"],
+            reverse=True,
+        ),
+        "items": sorted(
+            (
+                {"phase": phase, "name": name, "seconds": round(seconds, 6)}
+                for (phase, name), seconds in items.items()
+            ),
+            key=lambda entry: entry["seconds"],
+            reverse=True,
+        ),
+    }
+
+
+def chrome_trace(timings: Iterable[Timing], origin: float) -> dict[str, Any]:
+    """Render timings as complete ("X") events in Chrome trace format."""
+    return {
+        "displayTimeUnit": "ms",
+        "traceEvents": [
+            {
+                "name": timing.name,
+                "cat": timing.phase,
+                "ph": "X",
+                "ts": round((timing.start - origin) * 1e6, 3),
+                "dur": round(timing.seconds * 1e6, 3),
+                "pid": os.getpid(),
+                "tid": timing.thread,
+            }
+            for timing in timings
+        ],
+    }
+
+
+def report_stem(kind: str) -> str:
+    """A file name (without suffix) unique to one report."""
+    return f"{kind}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{time.time_ns()}"
+
+
+def write_report(
+    directory: Path,
+    kind: str,
+    timings: list[Timing],
+    origin: float,
+    total: float,
+    stem: str | None = None,
+) -> Path:
+    """Write the JSON report and the Chrome trace; return the JSON report's path."""
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = stem or report_stem(kind)
+    path = directory / f"{stem}.json"
+    path.write_text(json.dumps(build_report(kind, timings, total), indent=2) + "\n")
+    trace = directory / f"{stem}.trace.json"
+    trace.write_text(json.dumps(chrome_trace(timings, origin)) + "\n")
+    return path
+
+
+def summarize(directory: Path) -> dict[str, Any]:
+    """Combine every report in a directory: total time per phase and per item."""
+    phases: dict[tuple[str, str], list[float]] = defaultdict(list)
+    items: dict[tuple[str, str, str], list[float]] = defaultdict(list)
+    reports = sorted(
+        path for path in directory.glob("*.json") if not path.name.endswith(".trace.json")
+    )
+    reports = [path for path in reports if path.name != "summary.json"]
+    for path in reports:
+        report = json.loads(path.read_text())
+        for entry in report["phases"]:
+            phases[report["kind"], entry["phase"]].append(entry["seconds"])
+        for entry in report["items"]:
+            items[report["kind"], entry["phase"], entry["name"]].append(entry["seconds"])
+
+    def rows(
+        table: dict[Any, list[float]], keys: tuple[str, ...]
+    ) -> list[dict[str, Any]]:
+        return sorted(
+            (
+                {
+                    **dict(zip(keys, key, strict=True)),
+                    "seconds": round(sum(times), 6),
+                    "mean_seconds": round(sum(times) / len(times), 6),
+                    "reports": len(times),
+                }
+                for key, times in table.items()
+            ),
+            key=lambda row: row["seconds"],
+            reverse=True,
+        )
+
+    return {
+        "reports": len(reports),
+        "phases": rows(phases, ("kind", "phase")),
+        "items": rows(items, ("kind", "phase", "name")),
+    }
+
+
+class RenderProfiler(Extension):
+    """Time every template compiled and rendered by the environment."""
+
+    def __init__(self, environment: Environment) -> None:
+        super().__init__(environment)
+        directory = os.environ.get(ENV_VAR)
+        if not directory:
+            return
+        directory = os.path.abspath(directory)
+        # Tasks run in the project directory, so they get the absolute path.
+        environment.globals["copier_profile_dir"] = directory
+        timings: list[Timing] = []
+        origin = time.perf_counter()
+
+        def flush() -> None:
+            if timings:
+                total = time.perf_counter() - origin
+                write_report(Path(directory), "render", timings, origin, total)
+                if all(timing.phase == "other" for timing in timings):
+                    _warn_no_phases()
+
+        self._instrument(environment, timings)
+        # Not the environment: copier-template-extensions keeps the last one
+        # alive until exit. The Worker goes as soon as the run returns.
+        weakref.finalize(_copier_worker() or environment, flush)
+
+    @staticmethod
+    def _instrument(environment: Environment, timings: list[Timing]) -> None:
+        # Compile time and a name for each template, until it is rendered.
+        pending: dict[int, tuple[str, float]] = {}
+
+        class ProfiledTemplate(environment.template_class):  # type: ignore[name-defined,misc]
+            def render(self, *args: Any, **kwargs: Any) -> str:
+                start = time.perf_counter()
+                try:
+                    return str(super().render(*args, **kwargs))
+                finally:
+                    name, seconds = pending.pop(id(self), (self.name or "<string>", 0.0))
+                    seconds += time.perf_counter() - start
+                    phase, question = _phase(sys._getframe(1))
+                    if question:
+                        name = f"{question}: {name}"
+                    timings.append(
+                        Timing(name, phase, start, seconds, threading.get_ident())
+                    )
+
+        def timed(method: Any, label: Any) -> Any:
+            def wrapper(source: Any, *args: Any, **kwargs: Any) -> Template:
+                start = time.perf_counter()
+                template: Template = method(source, *args, **kwargs)
+                pending[id(template)] = (label(source), time.perf_counter() - start)
+                return template
+
+            return wrapper
+
+        def snippet(source: Any) -> str:
+            # Strings have no name; label them with their (shortened) source.
+            text = " ".join(str(source).split())
+            return text if len(text) <= 80 else text[:77] + "..."
+
+        environment.template_class = ProfiledTemplate
+        environment.get_template = timed(environment.get_template, str)  # type: ignore[method-assign]
+        environment.from_string = timed(environment.from_string, snippet)  # type: ignore[method-assign]
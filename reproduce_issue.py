@@ -1,8 +1,14 @@
 import shutil
+import sys
+import tempfile
 from pathlib import Path
 
 from copier import run_copy
 
+# The maintenance scripts import each other as top-level modules.
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+from template_snapshot import snapshot_template
+
 
 def reproduce():
     root_path = Path.cwd()
@@ -27,14 +33,15 @@ def reproduce():
     }
 
     print("Running copier...")
-    run_copy(
-        src_path=str(root_path),
-        dst_path=str(destination_path),
-        data=data,
-        defaults=True,
-        unsafe=True,
-        vcs_ref="HEAD",
-    )
+    # Render the working tree directly, so edits don't need to be committed first.
+    with tempfile.TemporaryDirectory() as snapshot:
+        run_copy(
+            src_path=str(snapshot_template(root_path, Path(snapshot))),
+            dst_path=str(destination_path),
+            data=data,
+            defaults=True,
+            unsafe=True,
+        )
 
     justfile = destination_path / "repro-project" / "justfile"
     if justfile.exists():
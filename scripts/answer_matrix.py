@@ -0,0 +1,416 @@
+"""
+Render the template over a combinatorial covering set of answers.
+
+The questions, their choices and their `when` conditions are read from
+copier.yaml. A greedy all-pairs (or, with --strength, t-wise) generator picks a
+small set of answer combinations in which every pair of answers that can occur
+together appears at least once. Each combination is rendered in a process pool
+and the generated tree is checked with the validators in VALIDATORS.
+
+cast_to_bool() mirrors how copier casts rendered `when` conditions and bool
+answers; scripts/generate_many.py uses it too.
+
+Usage:
+    python scripts/answer_matrix.py [--strength 2] [--workers 4] [--seed 0]
+"""
+
+import argparse
+import itertools
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tomllib
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml  # type: ignore[import-untyped]
+from copier import run_copy
+from jinja2 import Environment
+from template_snapshot import snapshot_template
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Answers for the free-text questions, which are not varied by the matrix.
+BASE_ANSWERS: dict[str, Any] = {
+    "project_name": "Matrix Project",
+    "project_slug": "matrix-project",
+    "module_name": "matrix_project",
+}
+
+Value = Any
+Assignment = tuple[str, Value]
+Combination = tuple[Assignment, ...]
+
+
+@dataclass(frozen=True)
+class Question:
+    """A copier question with a finite set of answers worth varying."""
+
+    name: str
+    choices: tuple[Value, ...]
+    when: str | bool = True
+
+
+@dataclass
+class CombinationResult:
+    """The outcome of rendering and validating one answer combination."""
+
+    index: int
+    answers: dict[str, Any]
+    seconds: float
+    failures: list[str] = field(default_factory=list)
+
+
+def cast_to_bool(value: Any) -> bool:
+    """Mirror copier's casting of rendered `when` values."""
+    try:
+        return bool(float(value))
+    except (TypeError, ValueError):
+        pass
+    if isinstance(value, str):
+        lower = value.strip().lower()
+        if lower in {"y", "yes", "t", "true", "on"}:
+            return True
+        if lower in {"n", "no", "f", "false", "off", "~", "null", "none", ""}:
+            return False
+    return bool(value)
+
+
+def _hashable(value: Any) -> Value:
+    return tuple(value) if isinstance(value, list) else value
+
+
+def load_questions(copier_yaml: Path = ROOT / "copier.yaml") -> list[Question]:
+    """
+    Read the user-facing questions with a finite answer domain from copier.yaml.
+
+    Booleans vary over True/False, choice questions over their choices and
+    multiselect questions over their default and the full selection. Settings
+    (`_*` keys), data-only variables (`when: false`) and free-text questions are
+    skipped.
+    """
+    config = yaml.safe_load(copier_yaml.read_text(encoding="utf-8"))
+    questions = []
+    for name, spec in config.items():
+        if name.startswith("_") or not isinstance(spec, dict):
+            continue
+        when = spec.get("when", True)
+        if when is False:
+            continue
+        default = spec.get("default")
+        choices = spec.get("choices")
+        if isinstance(choices, dict):
+            choices = list(choices.values())
+        if spec.get("multiselect"):
+            domain = [_hashable(default or []), _hashable(choices)]
+        elif choices:
+            domain = list(choices)
+        elif spec.get("type") == "bool":
+            domain = [True, False]
+        else:
+            continue
+        # Put the default first so that filler values stay close to the defaults.
+        if default in domain:
+            domain.remove(default)
+            domain.insert(0, default)
+        questions.append(Question(name, tuple(dict.fromkeys(domain)), when))
+    return questions
+
+
+def _active(question: Question, answers: dict[str, Any], env: Environment) -> bool:
+    """Evaluate a question's `when` condition the way copier would."""
+    if isinstance(question.when, bool):
+        return question.when
+    rendered = env.from_string(str(question.when)).render(**answers)
+    return cast_to_bool(rendered)
+
+
+def normalize(
+    row: dict[str, Value], questions: list[Question], env: Environment
+) -> dict[str, Value]:
+    """Drop the answers to questions that copier would not ask for this row."""
+    context = dict(BASE_ANSWERS)
+    answers = {}
+    for question in questions:
+        if question.name in row and _active(question, context, env):
+            answers[question.name] = row[question.name]
+            context[question.name] = row[question.name]
+    return answers
+
+
+def _tuples_in(
+    row: dict[str, Value], order: dict[str, int], strength: int
+) -> set[Combination]:
+    assignments = sorted(row.items(), key=lambda item: order[item[0]])
+    return set(itertools.combinations(assignments, strength))
+
+
+def _complete_row(
+    row: dict[str, Value],
+    questions: list[Question],
+    by_assignment: dict[Assignment, set[Combination]],
+    rng: random.Random,
+) -> dict[str, Value]:
+    """Fill in the unanswered questions, greedily maximizing new coverage."""
+    remaining = [question for question in questions if question.name not in row]
+    rng.shuffle(remaining)
+    for question in remaining:
+        scores = []
+        for value in question.choices:
+            # Count the uncovered combinations this value would complete.
+            score = sum(
+                all(row.get(name, value) == chosen for name, chosen in combination)
+                for combination in by_assignment.get((question.name, value), ())
+                if all(name in row or name == question.name for name, _ in combination)
+            )
+            scores.append((score, rng.random(), value))
+        row[question.name] = max(scores, key=lambda item: item[:2])[2]
+    return row
+
+
+def _all_combinations(questions: list[Question], strength: int) -> set[Combination]:
+    """Every t-wise combination of answers, ignoring `when` conditions."""
+    combinations: set[Combination] = set()
+    for group in itertools.combinations(questions, strength):
+        names = [question.name for question in group]
+        for values in itertools.product(*(question.choices for question in group)):
+            combinations.add(tuple(zip(names, values, strict=True)))
+    return combinations
+
+
+def covering_set(
+    questions: list[Question],
+    strength: int = 2,
+    seed: int = 0,
+    candidates: int = 16,
+) -> list[dict[str, Value]]:
+    """
+    Greedily build answer rows covering every feasible t-wise combination.
+
+    Each row is seeded with one uncovered combination and completed value by
+    value, preferring the value that covers the most uncovered combinations
+    alongside those already chosen. Rows are normalized against the `when`
+    conditions, so a combination whose members can never be asked together is
+    dropped as infeasible rather than looped on.
+    """
+    env = Environment()
+    rng = random.Random(seed)
+    order = {question.name: index for index, question in enumerate(questions)}
+    uncovered = _all_combinations(questions, strength)
+
+    # Index the uncovered combinations by each assignment they contain.
+    by_assignment: dict[Assignment, set[Combination]] = {}
+    for combination in uncovered:
+        for assignment in combination:
+            by_assignment.setdefault(assignment, set()).add(combination)
+
+    rows: list[dict[str, Value]] = []
+    while uncovered:
+        target = min(uncovered, key=repr)
+        best_row: dict[str, Value] = {}
+        best_covered: set[Combination] = set()
+        for _ in range(candidates):
+            row = _complete_row(dict(target), questions, by_assignment, rng)
+            row = normalize(row, questions, env)
+            covered = _tuples_in(row, order, strength) & uncovered
+            if target in covered and len(covered) > len(best_covered):
+                best_row, best_covered = row, covered
+        if best_covered:
+            rows.append(best_row)
+        else:
+            # No completion of the seed keeps all of its questions active.
+            best_covered = {target}
+        uncovered -= best_covered
+        for combination in best_covered:
+            for assignment in combination:
+                by_assignment[assignment].discard(combination)
+    return rows
+
+
+# --- Validators -------------------------------------------------------------
+# Each validator receives the generated project directory and the answers that
+# produced it, and returns a list of human-readable problems.
+
+
+def check_pyproject_parses(project_path: Path, answers: dict[str, Any]) -> list[str]:
+    """pyproject.toml must be valid TOML."""
+    try:
+        tomllib.loads((project_path / "pyproject.toml").read_text(encoding="utf-8"))
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        return [f"pyproject.toml: {e}"]
+    return []
+
+
+def _justfile_recipes(content: str) -> dict[str, list[str]]:
+    """Map each justfile recipe name to the `just` tasks its body calls."""
+    recipes: dict[str, list[str]] = {}
+    current: list[str] = []
+    for line in content.splitlines():
+        if match := re.match(r"^([A-Za-z0-9_-]+)[^:=]*:(?!=)", line):
+            current = recipes.setdefault(match.group(1), [])
+        elif line[:1].isspace():
+            current.extend(re.findall(r"@?just ([A-Za-z0-9_-]+)", line))
+    return recipes
+
+
+def check_qa_tasks_exist(project_path: Path, answers: dict[str, Any]) -> list[str]:
+    """Every task in the composite `qa` task must be defined for the task runner."""
+    if answers.get("task_runner", "pdm") == "just":
+        justfile = project_path / "justfile"
+        if not justfile.is_file():
+            return ["justfile is missing"]
+        recipes = _justfile_recipes(justfile.read_text(encoding="utf-8"))
+        qa_tasks = recipes.get("qa")
+        defined = set(recipes)
+    else:
+        try:
+            pyproject = tomllib.loads(
+                (project_path / "pyproject.toml").read_text(encoding="utf-8")
+            )
+        except (OSError, tomllib.TOMLDecodeError):
+            return []  # Reported by check_pyproject_parses.
+        scripts = pyproject.get("tool", {}).get("pdm", {}).get("scripts", {})
+        qa_tasks = scripts.get("qa", {}).get("composite")
+        defined = set(scripts)
+    if not qa_tasks:
+        return ["no composite 'qa' task is defined"]
+    return [
+        f"qa task '{task}' is not defined" for task in qa_tasks if task not in defined
+    ]
+
+
+def check_yaml_parses(project_path: Path, answers: dict[str, Any]) -> list[str]:
+    """Every generated YAML file must be valid YAML."""
+    problems = []
+    for path in sorted([*project_path.rglob("*.yml"), *project_path.rglob("*.yaml")]):
+        try:
+            yaml.safe_load(path.read_text(encoding="utf-8"))
+        except yaml.YAMLError as e:
+            problems.append(f"{path.relative_to(project_path).as_posix()}: {e}")
+    return problems
+
+
+Validator = Callable[[Path, dict[str, Any]], list[str]]
+
+VALIDATORS: list[Validator] = [
+    check_pyproject_parses,
+    check_qa_tasks_exist,
+    check_yaml_parses,
+]
+
+
+# --- Rendering --------------------------------------------------------------
+
+
+def render_combination(
+    index: int, answers: dict[str, Any], template: str
+) -> CombinationResult:
+    """Render one combination of a template snapshot and validate the result."""
+    data = {
+        **BASE_ANSWERS,
+        **{k: list(v) if isinstance(v, tuple) else v for k, v in answers.items()},
+    }
+    started = time.perf_counter()
+    failures = []
+    with tempfile.TemporaryDirectory(prefix="answer-matrix-") as destination:
+        try:
+            run_copy(
+                template,
+                destination,
+                data=data,
+                defaults=True,
+                skip_tasks=True,
+                unsafe=True,
+                quiet=True,
+            )
+        except Exception as e:
+            failures.append(f"render failed: {type(e).__name__}: {e}")
+        else:
+            project_path = Path(destination) / data["project_slug"]
+            for validator in VALIDATORS:
+                failures.extend(validator(project_path, data))
+    return CombinationResult(index, data, time.perf_counter() - started, failures)
+
+
+def run_matrix(
+    rows: Iterable[dict[str, Any]],
+    workers: int | None = None,
+    template: str | None = None,
+) -> list[CombinationResult]:
+    """
+    Render every row in a process pool and return the results in row order.
+
+    Rows are rendered from `template`, or from a fresh snapshot of the working
+    tree when it is not given, so no worker has to clone the repository.
+    """
+    with tempfile.TemporaryDirectory(prefix="template-snapshot-") as snapshot:
+        if template is None:
+            template = str(snapshot_template(ROOT, Path(snapshot)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(render_combination, index, row, template)
+                for index, row in enumerate(rows)
+            ]
+            results = [future.result() for future in as_completed(futures)]
+    return sorted(results, key=lambda result: result.index)
+
+
+def report(
+    results: list[CombinationResult], elapsed: float, baseline: dict[str, Any]
+) -> None:
+    """Print one line per combination followed by a throughput summary."""
+    for result in results:
+        status = "FAIL" if result.failures else "ok"
+        varied = ", ".join(
+            f"{key}={value}"
+            for key, value in result.answers.items()
+            if baseline.get(key) != _hashable(value) and key not in BASE_ANSWERS
+        )
+        varied = varied or "(defaults)"
+        print(f"[{result.index:3d}] {status:4} {result.seconds:6.2f}s  {varied}")
+        for failure in result.failures:
+            print(f"        - {failure}")
+    failed = sum(1 for result in results if result.failures)
+    rate = len(results) / elapsed if elapsed else 0.0
+    print(
+        f"\n{len(results)} combinations in {elapsed:.1f}s "
+        f"({rate:.2f} renders/s), {failed} failed"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Generate the covering set, render it and report the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--strength",
+        type=int,
+        default=2,
+        help="Cover every t-wise combination (default: 2).",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="Number of render processes."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for tie-breaking.")
+    args = parser.parse_args(argv)
+
+    questions = load_questions()
+    rows = covering_set(questions, strength=args.strength, seed=args.seed)
+    print(
+        f"{len(questions)} questions, {len(rows)} combinations "
+        f"cover all {args.strength}-wise interactions."
+    )
+    started = time.perf_counter()
+    results = run_matrix(rows, workers=args.workers)
+    baseline = {question.name: question.choices[0] for question in questions}
+    report(results, time.perf_counter() - started, baseline)
+    return 1 if any(result.failures for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
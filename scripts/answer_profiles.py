@@ -0,0 +1,82 @@
+"""
+Named answer profiles shared by the template benchmarks and tests.
+
+Each profile is a partial answers dict layered on top of BASE_ANSWERS; anything
+not listed falls back to the defaults in copier.yaml.
+"""
+
+from typing import Any
+
+BASE_ANSWERS: dict[str, Any] = {
+    "project_name": "Test Project",
+    "project_slug": "test-project",
+    "module_name": "test_project",
+    "author_name": "Tom Dakan",
+    "author_email": "tomdakan@gmail.com",
+    "python_version": "3.13",
+}
+
+PROFILES: dict[str, dict[str, Any]] = {
+    # Every optional feature switched off.
+    "minimal": {
+        "cli": False,
+        "task_tracking": "None",
+        "use_dependabot": False,
+        "use_detect_secrets": False,
+        "add_code_of_conduct": False,
+        "add_security_md": False,
+        "add_citation_cff": False,
+        "use_docs": False,
+        "include_adr": False,
+    },
+    # Whatever copier.yaml defaults to.
+    "defaults": {},
+    # Every optional feature switched on (except publishing to GitHub).
+    "everything-on": {
+        "cli": True,
+        "run_qa_checks": True,
+        "precommit_install": True,
+        "docker_support": True,
+        "generate_env": True,
+        "initialize_git": True,
+        "push_to_github": False,
+        "task_tracking": "GitHub Projects",
+        "task_runner": "just",
+        "config_library": "typed-settings",
+        "use_semantic_release": True,
+        "use_safety": True,
+        "use_bandit": True,
+        "use_dependabot": True,
+        "dependabot_automerge": True,
+        "use_codecov": True,
+        "use_detect_secrets": True,
+        "badges": True,
+        "use_docs": True,
+        "use_mkdocstrings": True,
+        "doc_hosting_provider": "Read the Docs",
+        "pytest_markers": ["unit", "integration", "slow", "cli", "network"],
+        "use_benchmarks": True,
+        "include_adr": True,
+    },
+    "cli+docs+adr": {
+        "cli": True,
+        "use_docs": True,
+        "use_mkdocstrings": True,
+        "include_adr": True,
+    },
+    "just-runner": {
+        "task_runner": "just",
+    },
+    # uv alone, wherever it changes a file (Dockerfile, CI, docs requirements).
+    "uv-installer": {
+        "installer": "uv",
+        "docker_support": True,
+        "use_docs": True,
+        "doc_hosting_provider": "Read the Docs",
+    },
+}
+
+
+def profile_answers(name: str) -> dict[str, Any]:
+    """Return the full answers dict for a named profile."""
+    return {**BASE_ANSWERS, **PROFILES[name]}
@@ -0,0 +1,413 @@
+"""
+Update many generated projects to a newer version of the template.
+
+For each repository, the template commit it was generated from is read from
+its .copier-answers.yml. The files under the template's subdirectory that
+changed between that commit and the target are then listed with `git diff`.
+Only those files are rendered, once at each commit, using the repository's
+recorded answers. Each rendered pair is three-way merged into the project with
+`git merge-file`, so local edits are kept. A change to copier.yaml can affect
+any file, so in that case the whole template is rendered at both commits.
+
+Everything is read from the local template repository with `git archive`. No
+repository is cloned or fetched, and nothing needs the network. Repositories
+are processed in parallel. Merged changes are left in each working tree for
+review, and conflicts are marked inline as `copier update` would mark them.
+
+Usage:
+    python scripts/fleet_update.py REPO [REPO ...] [--to REF] [--from REF]
+                                   [--template DIR] [--workers N] [--dry-run]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml  # type: ignore[import-untyped]
+from copier import run_copy
+from template_snapshot import ROOT, TEMPLATE_INPUTS, export_ref
+
+ANSWERS_HEADER = "# Changes here will be overwritten by Copier; NEVER EDIT MANUALLY\n"
+
+
+@dataclass
+class RepoResult:
+    """The outcome of updating one generated repository."""
+
+    path: Path
+    status: str = "pending"
+    old_commit: str = ""
+    new_commit: str = ""
+    seconds: float = 0.0
+    updated: list[str] = field(default_factory=list)
+    conflicts: list[str] = field(default_factory=list)
+    problems: list[str] = field(default_factory=list)
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _exists(template: Path, commit: str, path: str) -> bool:
+    completed = subprocess.run(
+        ["git", "cat-file", "-e", f"{commit}:{path}"], cwd=template, capture_output=True
+    )
+    return completed.returncode == 0
+
+
+def resolve_commit(template: Path, ref: str) -> str:
+    """Resolve a ref, including `git describe` output such as v1.0.0-3-gabc1234."""
+    return _git(template, "rev-parse", "--verify", f"{ref}^{{commit}}")
+
+
+def _shared_inputs(subdirectory: str) -> list[str]:
+    return [name for name in TEMPLATE_INPUTS if name != subdirectory]
+
+
+def changed_paths(
+    template: Path, old: str, new: str, subdirectory: str
+) -> tuple[list[str], list[str]] | None:
+    """
+    List the template files to render at the old and the new commit.
+
+    Returns None when an input that feeds every render (copier.yaml or the
+    Jinja extensions) changed, meaning the whole template must be rendered.
+    """
+    diff = _git(template, "diff", "--name-status", "--no-renames", old, new)
+    old_paths, new_paths = [], []
+    for line in diff.splitlines():
+        status, path = line.split("\t", 1)
+        if any(path.split("/")[0] == name for name in _shared_inputs(subdirectory)):
+            return None
+        if not path.startswith(f"{subdirectory}/"):
+            continue
+        if status != "A":
+            old_paths.append(path)
+        if status != "D":
+            new_paths.append(path)
+    return old_paths, new_paths
+
+
+def render_at(
+    template: Path,
+    commit: str,
+    paths: list[str] | None,
+    subdirectory: str,
+    answers: dict[str, Any],
+    destination: Path,
+) -> Path:
+    """Render the given template files (all of them if None) at a commit."""
+    source = destination / "template"
+    if paths is not None:
+        shared = _shared_inputs(subdirectory)
+        paths = [name for name in shared if _exists(template, commit, name)] + paths
+    export_ref(template, commit, source, paths or [])
+    (source / subdirectory).mkdir(parents=True, exist_ok=True)
+    output = destination / "output"
+    run_copy(
+        str(source),
+        output,
+        data=answers,
+        defaults=True,
+        skip_tasks=True,
+        unsafe=True,
+        quiet=True,
+    )
+    # The template renders everything inside a {{ project_slug }} directory.
+    return output / str(answers["project_slug"])
+
+
+def _files(root: Path) -> dict[str, Path]:
+    if not root.is_dir():
+        return {}
+    return {
+        path.relative_to(root).as_posix(): path
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+def merge_file(
+    ours: Path, base: Path | None, theirs: Path, label: str
+) -> tuple[bytes, bool]:
+    """
+    Three-way merge the template's change from base to theirs into ours.
+
+    A file the template added has no base; it is merged against an empty one,
+    so differing local content shows up as a conflict. Returns the merged bytes
+    and whether they contain conflict markers.
+    """
+    with tempfile.TemporaryDirectory(prefix="fleet-merge-") as scratch:
+        if base is None:
+            base = Path(scratch) / "empty"
+            base.touch()
+        completed = subprocess.run(
+            [
+                "git",
+                "merge-file",
+                "-p",
+                "-L",
+                f"{label} (local)",
+                "-L",
+                f"{label} (template before)",
+                "-L",
+                f"{label} (template after)",
+                ours,
+                base,
+                theirs,
+            ],
+            capture_output=True,
+        )
+    if completed.returncode < 0 or completed.returncode > 127:
+        raise RuntimeError(completed.stderr.decode(errors="replace").strip())
+    return completed.stdout, completed.returncode > 0
+
+
+def _remove(name: str, base: Path | None, ours: Path, dry_run: bool) -> str | None:
+    """Drop a file removed from the template, unless it was edited locally."""
+    if not ours.is_file():
+        return None
+    if base is None or ours.read_bytes() != base.read_bytes():
+        return f"{name} (removed from the template)"
+    if not dry_run:
+        ours.unlink()
+    return ""
+
+
+def _apply_one(
+    name: str, base: Path | None, theirs: Path | None, ours: Path, dry_run: bool
+) -> str | None:
+    """
+    Bring one project file up to date with the template.
+
+    Returns None when the file is left as it is, "" when it was updated, or a
+    description of the conflict.
+    """
+    if theirs is None:
+        return _remove(name, base, ours, dry_run)
+    if not ours.is_file():
+        # Deleted locally (e.g. bootstrap.py): only create brand new files.
+        if base is not None:
+            return None
+        if not dry_run:
+            ours.parent.mkdir(parents=True, exist_ok=True)
+            ours.write_bytes(theirs.read_bytes())
+        return ""
+    if ours.read_bytes() == theirs.read_bytes():
+        return None
+    try:
+        merged, conflicted = merge_file(ours, base, theirs, name)
+    except RuntimeError as e:
+        return f"{name} ({e})"
+    if not dry_run:
+        ours.write_bytes(merged)
+    return name if conflicted else ""
+
+
+def apply_changes(
+    repo: Path,
+    before: Path,
+    after: Path,
+    result: RepoResult,
+    skip: set[str],
+    dry_run: bool,
+) -> None:
+    """Merge every file whose rendering differs between `before` and `after`."""
+    old_files, new_files = _files(before), _files(after)
+    for name in sorted(old_files.keys() | new_files.keys()):
+        base, theirs = old_files.get(name), new_files.get(name)
+        if name in skip or (base and theirs and base.read_bytes() == theirs.read_bytes()):
+            continue
+        outcome = _apply_one(name, base, theirs, repo / name, dry_run)
+        if outcome == "":
+            result.updated.append(name)
+        elif outcome is not None:
+            result.conflicts.append(outcome)
+
+
+def write_answers(
+    path: Path, rendered: Path, old_answers: dict[str, Any], commit: str
+) -> None:
+    """Record the new commit, plus any answers added by new questions."""
+    answers = dict(old_answers)
+    if rendered.is_file():
+        new_answers = yaml.safe_load(rendered.read_text(encoding="utf-8")) or {}
+        answers.update(
+            {
+                key: value
+                for key, value in new_answers.items()
+                if key not in answers and not key.startswith("_")
+            }
+        )
+    answers["_commit"] = commit
+    body = yaml.safe_dump(answers, allow_unicode=True, default_flow_style=False)
+    path.write_text(ANSWERS_HEADER + body, encoding="utf-8")
+
+
+def update_repo(
+    repo: Path,
+    template: Path,
+    new_commit: str,
+    from_ref: str | None = None,
+    answers_file: str = ".copier-answers.yml",
+    dry_run: bool = False,
+) -> RepoResult:
+    """Bring one repository from its recorded template commit up to new_commit."""
+    result = RepoResult(repo)
+    started = time.perf_counter()
+    try:
+        _update_repo(result, template, new_commit, from_ref, answers_file, dry_run)
+    except Exception as e:
+        result.status = "error"
+        result.problems.append(f"{type(e).__name__}: {e}")
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def _update_repo(
+    result: RepoResult,
+    template: Path,
+    new_commit: str,
+    from_ref: str | None,
+    answers_file: str,
+    dry_run: bool,
+) -> None:
+    repo = result.path
+    answers_path = repo / answers_file
+    if not answers_path.is_file():
+        raise FileNotFoundError(f"{answers_file} not found")
+    recorded = yaml.safe_load(answers_path.read_text(encoding="utf-8")) or {}
+    old_ref = from_ref or recorded.get("_commit")
+    if not old_ref:
+        raise ValueError(f"no _commit in {answers_file}; pass --from")
+    if _git(repo, "status", "--porcelain"):
+        result.status = "dirty"
+        result.problems.append("commit or stash local changes first")
+        return
+
+    result.old_commit = old_commit = resolve_commit(template, str(old_ref))
+    result.new_commit = _git(template, "describe", "--tags", "--always", new_commit)
+    if old_commit == new_commit:
+        result.status = "up to date"
+        return
+
+    config = yaml.safe_load(_git(template, "show", f"{new_commit}:copier.yaml"))
+    subdirectory = config.get("_subdirectory", "")
+    answers_template = (
+        f"{subdirectory}/{{{{ project_slug }}}}/{{{{ _copier_conf.answers_file }}}}.jinja"
+    )
+    changes = changed_paths(template, old_commit, new_commit, subdirectory)
+    answers = {key: value for key, value in recorded.items() if not key.startswith("_")}
+    with tempfile.TemporaryDirectory(prefix="fleet-update-") as scratch:
+        old_paths, new_paths = changes if changes else (None, None)
+        if new_paths is not None and _exists(template, new_commit, answers_template):
+            new_paths.append(answers_template)
+        before = render_at(
+            template, old_commit, old_paths, subdirectory, answers, Path(scratch) / "old"
+        )
+        after = render_at(
+            template, new_commit, new_paths, subdirectory, answers, Path(scratch) / "new"
+        )
+        apply_changes(repo, before, after, result, {answers_file}, dry_run)
+        if not dry_run:
+            write_answers(answers_path, after / answers_file, recorded, result.new_commit)
+    result.status = "conflicts" if result.conflicts else "updated"
+
+
+def update_fleet(
+    repos: list[Path],
+    template: Path = ROOT,
+    to_ref: str = "HEAD",
+    from_ref: str | None = None,
+    workers: int | None = None,
+    dry_run: bool = False,
+) -> list[RepoResult]:
+    """Update every repository in a process pool and return results in order."""
+    new_commit = resolve_commit(template, to_ref)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(
+            pool.map(
+                update_repo,
+                repos,
+                [template] * len(repos),
+                [new_commit] * len(repos),
+                [from_ref] * len(repos),
+                [".copier-answers.yml"] * len(repos),
+                [dry_run] * len(repos),
+            )
+        )
+
+
+def report(results: list[RepoResult], elapsed: float) -> None:
+    """Print one line per repository, its merged files and its conflicts."""
+    for result in results:
+        commits = (
+            f"{result.old_commit[:10]} -> {result.new_commit}"
+            if result.old_commit
+            else ""
+        )
+        print(f"{result.status:11} {result.seconds:6.2f}s  {result.path}  {commits}")
+        for name in result.updated:
+            print(f"        M {name}")
+        for name in result.conflicts:
+            print(f"        C {name}")
+        for problem in result.problems:
+            print(f"        - {problem}")
+    failed = sum(
+        1 for result in results if result.status in {"conflicts", "error", "dirty"}
+    )
+    print(f"\n{len(results)} repositories in {elapsed:.1f}s, {failed} need attention")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Update the given repositories and report the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("repos", nargs="+", type=Path, help="Generated repositories.")
+    parser.add_argument("--to", default="HEAD", help="Template ref to update to.")
+    parser.add_argument(
+        "--from",
+        dest="from_ref",
+        help="Template ref to update from, for repositories with no _commit.",
+    )
+    parser.add_argument(
+        "--template",
+        type=Path,
+        default=ROOT,
+        help="Local clone of the template (default: this repository).",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="Number of processes."
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report the changes without writing them."
+    )
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    results = update_fleet(
+        [repo.resolve() for repo in args.repos],
+        template=args.template.resolve(),
+        to_ref=args.to,
+        from_ref=args.from_ref,
+        workers=args.workers,
+        dry_run=args.dry_run,
+    )
+    report(results, time.perf_counter() - started)
+    return (
+        1
+        if any(result.status in {"conflicts", "error", "dirty"} for result in results)
+        else 0
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,391 @@
+"""
+Generate many projects from the template in one go.
+
+The manifest is a YAML or CSV file with one answer set per project. A YAML
+manifest is either a list of answer mappings or a mapping with `defaults` (shared
+by every project) and `projects`:
+
+    defaults:
+      author_name: Platform Team
+      task_runner: just
+    projects:
+      - project_name: Billing Service
+      - project_name: Ledger Service
+        cli: true
+
+A CSV manifest has one column per question. Each cell is parsed as YAML, so
+`true`, `120` and `[unit, slow]` keep their types. Empty cells fall back to the
+copier.yaml defaults.
+
+Every answer set is checked against the validators in copier.yaml before
+anything is rendered. Valid sets are then rendered in a process pool from a
+single snapshot of the template. Copier's `_tasks` are skipped unless
+--bootstrap-workers is given. In that case each project's bootstrap.py runs in a
+thread pool of that size, because the bootstrap steps mostly wait on
+subprocesses.
+
+Usage:
+    python scripts/generate_many.py MANIFEST [--output DIR] [--workers N]
+                                             [--bootstrap-workers N]
+                                             [--bootstrap-timeout SECONDS]
+"""
+
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml  # type: ignore[import-untyped]
+from answer_matrix import cast_to_bool
+from copier import run_copy
+from jinja2.sandbox import SandboxedEnvironment
+from template_snapshot import snapshot_template
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Copier loads these extensions into every environment, so validators may use
+# their filters (e.g. regex_search).
+DEFAULT_JINJA_EXTENSIONS = ["jinja2_ansible_filters.AnsibleCoreFiltersExtension"]
+
+# Seconds a project's bootstrap.py may run before it is killed.
+BOOTSTRAP_TIMEOUT = 600.0
+
+
+@dataclass
+class ProjectResult:
+    """The outcome of generating one project from the manifest."""
+
+    index: int
+    answers: dict[str, Any]
+    status: str = "pending"
+    render_seconds: float = 0.0
+    bootstrap_seconds: float = 0.0
+    problems: list[str] = field(default_factory=list)
+
+    @property
+    def slug(self) -> str:
+        return str(self.answers.get("project_slug") or self.answers.get("project_name"))
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+# --- Manifest ---------------------------------------------------------------
+
+
+def _parse_cell(value: str) -> Any:
+    """Parse a CSV cell as YAML so booleans, numbers and lists keep their type."""
+    try:
+        return yaml.safe_load(value)
+    except yaml.YAMLError:
+        return value
+
+
+def load_manifest(path: Path) -> list[dict[str, Any]]:
+    """Read the answer sets from a YAML or CSV manifest."""
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() == ".csv":
+        rows = csv.DictReader(text.splitlines())
+        return [
+            {
+                key.strip(): _parse_cell(value)
+                for key, value in row.items()
+                if key and value is not None and value.strip()
+            }
+            for row in rows
+        ]
+
+    manifest = yaml.safe_load(text) or []
+    defaults: dict[str, Any] = {}
+    if isinstance(manifest, dict):
+        defaults = manifest.get("defaults") or {}
+        manifest = manifest.get("projects") or []
+    if not isinstance(manifest, list) or not all(
+        isinstance(entry, dict) for entry in manifest
+    ):
+        raise ValueError(
+            f"{path}: expected a list of answer mappings or a 'projects' list"
+        )
+    return [{**defaults, **entry} for entry in manifest]
+
+
+# --- Validation -------------------------------------------------------------
+
+
+def _cast_answer(spec: dict[str, Any], value: Any) -> Any:
+    """Cast a rendered default to the question's type, as copier does."""
+    if not isinstance(value, str):
+        return value
+    kind = spec.get("type")
+    if kind == "bool":
+        return cast_to_bool(value)
+    if kind == "int":
+        return int(value)
+    if kind == "float":
+        return float(value)
+    if kind in {"yaml", "json"}:
+        return yaml.safe_load(value)
+    return value
+
+
+class AnswerValidator:
+    """
+    Check answer sets against the questions and validators in copier.yaml.
+
+    Questions are walked in file order, as copier asks them. Missing answers are
+    filled from their rendered defaults, and questions whose `when` condition is
+    false are skipped.
+    """
+
+    def __init__(self, copier_yaml: Path = ROOT / "copier.yaml") -> None:
+        config = yaml.safe_load(copier_yaml.read_text(encoding="utf-8"))
+        self.questions = {
+            name: spec
+            for name, spec in config.items()
+            if not name.startswith("_") and isinstance(spec, dict)
+        }
+        envops = {"keep_trailing_newline": True, **config.get("_envops", {})}
+        self.env = SandboxedEnvironment(extensions=DEFAULT_JINJA_EXTENSIONS, **envops)
+
+    def _render(self, source: str, context: dict[str, Any]) -> str:
+        return self.env.from_string(source).render(**context)
+
+    def _problems(
+        self, name: str, spec: dict[str, Any], context: dict[str, Any]
+    ) -> list[str]:
+        """Check one answer against its choices and its validator template."""
+        problems = []
+        value = context[name]
+        choices = spec.get("choices")
+        if isinstance(choices, dict):
+            choices = list(choices.values())
+        if choices and not spec.get("multiselect") and value not in choices:
+            problems.append(f"{name}: {value!r} is not one of {choices}")
+        if "validator" in spec:
+            message = self._render(spec["validator"], context).strip()
+            if message:
+                problems.append(f"{name}: {' '.join(message.split())}")
+        return problems
+
+    def validate(self, answers: dict[str, Any]) -> list[str]:
+        """Return copier's validation message for every invalid answer."""
+        problems = []
+        context: dict[str, Any] = {"_copier_python": sys.executable}
+        for name, spec in self.questions.items():
+            try:
+                value = answers.get(name, spec.get("default"))
+                if name not in answers and isinstance(value, str):
+                    value = _cast_answer(spec, self._render(value, context))
+                context[name] = value
+                when = spec.get("when", True)
+                if isinstance(when, str):
+                    when = cast_to_bool(self._render(when, context))
+                if when:
+                    problems.extend(self._problems(name, spec, context))
+            except Exception as e:
+                problems.append(f"{name}: {type(e).__name__}: {e}")
+        return problems
+
+    def resolve(self, answers: dict[str, Any]) -> dict[str, Any]:
+        """Fill in project_slug, which names the output directory, if missing."""
+        if "project_slug" in answers:
+            return answers
+        default = self.questions["project_slug"]["default"]
+        context = {"project_name": self.questions["project_name"]["default"], **answers}
+        return {**answers, "project_slug": self._render(default, context)}
+
+
+# --- Generation -------------------------------------------------------------
+
+
+def render_project(
+    index: int, answers: dict[str, Any], template: str, output: Path
+) -> ProjectResult:
+    """Render one answer set into output/<project_slug>."""
+    result = ProjectResult(index, answers)
+    destination = output / result.slug
+    started = time.perf_counter()
+    # Render into a private directory so workers never share a copier destination.
+    with tempfile.TemporaryDirectory(prefix=".generate-many-", dir=output) as staging:
+        try:
+            run_copy(
+                template,
+                staging,
+                data=answers,
+                defaults=True,
+                skip_tasks=True,
+                unsafe=True,
+                quiet=True,
+            )
+            (Path(staging) / result.slug).rename(destination)
+        except Exception as e:
+            result.status = "render failed"
+            result.problems.append(f"{type(e).__name__}: {e}")
+        else:
+            result.status = "ok"
+    result.render_seconds = time.perf_counter() - started
+    return result
+
+
+def bootstrap_project(
+    result: ProjectResult, output: Path, timeout: float = BOOTSTRAP_TIMEOUT
+) -> ProjectResult:
+    """
+    Run copier's `_tasks`: bootstrap.py, which removes itself when it succeeds.
+
+    A bootstrap still running after `timeout` seconds is killed and reported as
+    failed, so one stuck project cannot hold a worker for the rest of the run.
+    """
+    project_path = output / result.slug
+    started = time.perf_counter()
+    try:
+        completed = subprocess.run(
+            [sys.executable, "bootstrap.py"],
+            cwd=project_path,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        result.bootstrap_seconds = time.perf_counter() - started
+        result.status = "bootstrap failed"
+        result.problems.append(f"bootstrap.py timed out after {timeout:g}s")
+        return result
+    result.bootstrap_seconds = time.perf_counter() - started
+    if completed.returncode:
+        result.status = "bootstrap failed"
+        tail = (completed.stderr or completed.stdout).strip().splitlines()[-5:]
+        result.problems.extend(tail)
+    return result
+
+
+def generate_many(
+    manifest: Iterable[dict[str, Any]],
+    output: Path,
+    workers: int | None = None,
+    bootstrap_workers: int = 0,
+    template: str | None = None,
+    bootstrap_timeout: float = BOOTSTRAP_TIMEOUT,
+) -> list[ProjectResult]:
+    """
+    Validate, render and optionally bootstrap every answer set in the manifest.
+
+    Nothing is rendered unless every answer set is valid and every destination
+    is free, so a bad manifest fails before it leaves half its projects behind.
+    """
+    validator = AnswerValidator()
+    results = [
+        ProjectResult(index, validator.resolve(answers))
+        for index, answers in enumerate(manifest)
+    ]
+    seen: set[str] = set()
+    for result in results:
+        result.problems = validator.validate(result.answers)
+        if result.slug in seen:
+            result.problems.append(f"project_slug '{result.slug}' is used twice")
+        elif (output / result.slug).exists():
+            result.problems.append(f"{output / result.slug} already exists")
+        seen.add(result.slug)
+        if result.problems:
+            result.status = "invalid"
+    if any(result.problems for result in results):
+        for result in results:
+            if not result.problems:
+                result.status = "skipped"
+        return results
+
+    output.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="template-snapshot-") as snapshot:
+        if template is None:
+            template = str(snapshot_template(ROOT, Path(snapshot)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(
+                    render_project,
+                    [result.index for result in results],
+                    [result.answers for result in results],
+                    [template] * len(results),
+                    [output] * len(results),
+                )
+            )
+
+    rendered = [result for result in results if result.ok]
+    if bootstrap_workers and rendered:
+        with ThreadPoolExecutor(max_workers=bootstrap_workers) as pool:
+            list(
+                pool.map(
+                    bootstrap_project,
+                    rendered,
+                    [output] * len(rendered),
+                    [bootstrap_timeout] * len(rendered),
+                )
+            )
+    return results
+
+
+def report(results: list[ProjectResult], elapsed: float) -> None:
+    """Print one line per project followed by a summary."""
+    width = max((len(result.slug) for result in results), default=0)
+    for result in results:
+        timings = f"{result.render_seconds:6.2f}s"
+        if result.bootstrap_seconds:
+            timings += f"  bootstrap {result.bootstrap_seconds:6.2f}s"
+        print(f"[{result.index:3d}] {result.slug:{width}}  {result.status:16} {timings}")
+        for problem in result.problems:
+            print(f"        - {problem}")
+    failed = sum(1 for result in results if not result.ok)
+    print(f"\n{len(results)} projects in {elapsed:.1f}s, {failed} failed")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Generate every project in the manifest and report the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("manifest", type=Path, help="YAML or CSV file of answer sets.")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path.cwd(),
+        help="Directory to generate the projects in (default: current directory).",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="Number of render processes."
+    )
+    parser.add_argument(
+        "--bootstrap-workers",
+        type=int,
+        default=0,
+        help="Run bootstrap.py for this many projects at a time (default: skip it).",
+    )
+    parser.add_argument(
+        "--bootstrap-timeout",
+        type=float,
+        default=BOOTSTRAP_TIMEOUT,
+        help="Seconds each bootstrap.py may run before it counts as failed.",
+    )
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    results = generate_many(
+        load_manifest(args.manifest),
+        args.output.resolve(),
+        workers=args.workers,
+        bootstrap_workers=args.bootstrap_workers,
+        bootstrap_timeout=args.bootstrap_timeout,
+    )
+    report(results, time.perf_counter() - started)
+    if any(result.status == "invalid" for result in results):
+        print("Nothing was generated: fix the manifest and try again.")
+    return 1 if any(not result.ok for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Golden manifests of generated projects.
+
+A manifest records what a rendered tree looks like in a form small enough to
+commit: the relative path and content hash of every file, plus a few parsed
+fields (dependencies, task names, badges, hooks, answers) that make a change
+obvious at a glance. The golden manifests in tests/golden/ are compared with a
+fresh render of each answer profile in tests/test_golden.py:
+
+    pytest tests/test_golden.py
+    pytest tests/test_golden.py --update-golden
+
+Values that change on every render (timestamps, the template's location) are
+normalized before hashing, so manifests only change when the template does.
+"""
+
+import difflib
+import hashlib
+import json
+import re
+import tomllib
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import yaml  # type: ignore[import-untyped]
+
+ANSWERS_FILE = ".copier-answers.yml"
+# Where the template came from and which commit, neither of which is content.
+VOLATILE_ANSWERS = re.compile(r"^_(src_path|commit): .*\n", re.MULTILINE)
+# LICENSE.md is stamped with the time it was rendered.
+TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")
+
+
+def _answers(text: str) -> str:
+    return VOLATILE_ANSWERS.sub("", text)
+
+
+def _timestamps(text: str) -> str:
+    return TIMESTAMP.sub("<timestamp>", text)
+
+
+NORMALIZERS: dict[str, Callable[[str], str]] = {
+    ANSWERS_FILE: _answers,
+    "LICENSE.md": _timestamps,
+}
+
+
+def read_normalized(path: Path, relative: str) -> bytes:
+    """A file's content with the volatile parts replaced."""
+    content = path.read_bytes()
+    normalize = NORMALIZERS.get(relative)
+    if normalize is None:
+        return content
+    return normalize(content.decode("utf-8")).encode("utf-8")
+
+
+def _pyproject(text: str) -> dict[str, Any]:
+    data = tomllib.loads(text)
+    project = data.get("project", {})
+    pdm = data.get("tool", {}).get("pdm", {})
+    scripts = pdm.get("scripts", {})
+    return {
+        "dependencies": project.get("dependencies", []),
+        "dev-dependencies": pdm.get("dev-dependencies")
+        or data.get("dependency-groups", {}),
+        "entry-points": project.get("scripts", {}),
+        "pdm-scripts": sorted(scripts),
+        "qa": scripts.get("qa", {}).get("composite", []),
+    }
+
+
+def _justfile(text: str) -> dict[str, Any]:
+    recipes = re.findall(r"^([A-Za-z][\w-]*)[^:\n=]*:(?!=)", text, re.MULTILINE)
+    return {"recipes": recipes}
+
+
+def _readme(text: str) -> dict[str, Any]:
+    return {"badges": re.findall(r"\[!\[([^\]]+)\]", text)}
+
+
+def _pre_commit(text: str) -> dict[str, Any]:
+    config = yaml.safe_load(text) or {}
+    hooks = [hook["id"] for repo in config.get("repos", []) for hook in repo["hooks"]]
+    return {"hooks": hooks}
+
+
+def _answers_fields(text: str) -> dict[str, Any]:
+    answers = yaml.safe_load(_answers(text)) or {}
+    return {"answers": answers}
+
+
+# The parsed fields recorded for the files that have them.
+FIELDS: dict[str, Callable[[str], dict[str, Any]]] = {
+    "pyproject.toml": _pyproject,
+    "justfile": _justfile,
+    "README.md": _readme,
+    ".pre-commit-config.yaml": _pre_commit,
+    ANSWERS_FILE: _answers_fields,
+}
+
+
+def build_manifest(project_path: Path) -> dict[str, Any]:
+    """Hash every file of a rendered project and parse its selected fields."""
+    files: dict[str, str] = {}
+    fields: dict[str, dict[str, Any]] = {}
+    for path in sorted(project_path.rglob("*")):
+        if not path.is_file():
+            continue
+        relative = path.relative_to(project_path).as_posix()
+        content = read_normalized(path, relative)
+        files[relative] = hashlib.sha256(content).hexdigest()[:16]
+        if relative in FIELDS:
+            fields[relative] = FIELDS[relative](content.decode("utf-8"))
+    return {"files": files, "fields": fields}
+
+
+def load_manifest(path: Path) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    manifest: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    return manifest
+
+
+def write_manifest(path: Path, manifest: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+
+
+def changed_files(golden: dict[str, Any], actual: dict[str, Any]) -> list[str]:
+    """Every path that was added, removed or whose content changed."""
+    expected, found = golden["files"], actual["files"]
+    return sorted(
+        path
+        for path in expected.keys() | found.keys()
+        if expected.get(path) != found.get(path)
+    )
+
+
+def describe_changes(
+    golden: dict[str, Any],
+    actual: dict[str, Any],
+    project_path: Path,
+    reference_path: Path | None = None,
+) -> str:
+    """
+    Explain how a render differs from its golden manifest, file by file.
+
+    Changed fields are listed for the files that have them. When a render that
+    matches the golden manifest is available as `reference_path`, changed files
+    also get a unified diff against it.
+    """
+    lines = []
+    for path in changed_files(golden, actual):
+        if path not in actual["files"]:
+            lines.append(f"removed: {path}")
+            continue
+        if path not in golden["files"]:
+            lines.append(f"added:   {path}")
+            continue
+        lines.append(f"changed: {path}")
+        old = golden["fields"].get(path, {})
+        new = actual["fields"].get(path, {})
+        lines.extend(
+            f"    {name}: {old.get(name)!r} -> {new.get(name)!r}"
+            for name in sorted(old.keys() | new.keys())
+            if old.get(name) != new.get(name)
+        )
+        if reference_path is not None and (reference_path / path).is_file():
+            diff = difflib.unified_diff(
+                read_normalized(reference_path / path, path)
+                .decode(errors="replace")
+                .splitlines(),
+                read_normalized(project_path / path, path)
+                .decode(errors="replace")
+                .splitlines(),
+                f"golden/{path}",
+                f"rendered/{path}",
+                lineterm="",
+            )
+            lines.extend(f"    {line}" for line in diff)
+    return "\n".join(lines)
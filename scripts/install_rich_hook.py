@@ -1,9 +1,51 @@
+"""
+Show uncaught exceptions in this venv's interpreters with rich tracebacks.
+
+`install` writes two files to site-packages: _rich_traceback_hook.py, an
+excepthook that imports rich only once an uncaught exception reaches it, and
+rich_traceback_hook.pth, which imports that small module when the interpreter
+starts. Interpreters that never crash (pytest workers, mypy, pre-commit hooks)
+never import rich.
+
+Earlier versions wrote a sitecustomize.py that imported rich on every start;
+`install` and `uninstall` remove it.
+
+Usage:
+    python scripts/install_rich_hook.py [install | uninstall | status]
+"""
+
+import argparse
 import site
 import sys
+import sysconfig
 from pathlib import Path
 
-# The code we want to put in sitecustomize.py
-RICH_HOOK = """
+HOOK_MODULE_NAME = "_rich_traceback_hook"
+HOOK_MODULE = '''"""Written by scripts/install_rich_hook.py; see its docstring."""
+
+import sys
+
+
+def excepthook(exc_type, exc, tb):
+    # Imported here, so only interpreters that crash pay for importing rich.
+    try:
+        from rich.console import Console
+        from rich.traceback import Traceback
+    except ImportError:
+        sys.__excepthook__(exc_type, exc, tb)
+        return
+    Console(stderr=True).print(Traceback.from_exception(exc_type, exc, tb))
+
+
+# Leave alone a hook something else installed.
+if sys.excepthook is sys.__excepthook__:
+    sys.excepthook = excepthook
+'''
+PTH_NAME = "rich_traceback_hook.pth"
+PTH = f"import {HOOK_MODULE_NAME}\n"
+
+# What earlier versions wrote to sitecustomize.py.
+LEGACY_HOOK = """
 try:
     from rich.traceback import install
     install()
@@ -12,35 +54,94 @@ except ImportError:
 """
 
 
-def main() -> None:
-    """
-    Adds sitecustomize.py to the site-packages directory to automate using Rich for
-    terminal formatting.
-    """
-    # Find the site-packages directory
+def site_packages() -> Path | None:
+    """The site-packages directory of the running interpreter."""
     try:
         # Use getsitepackages() which returns a list
-        site_packages_path = site.getsitepackages()[0]
-    except AttributeError:
+        return Path(site.getsitepackages()[0])
+    except (AttributeError, IndexError):
         # Fallback for some venv configurations
-        import sysconfig
+        purelib = sysconfig.get_path("purelib")
+        return Path(purelib) if purelib else None
+
+
+def hook_files(site_dir: Path) -> list[Path]:
+    return [site_dir / PTH_NAME, site_dir / f"{HOOK_MODULE_NAME}.py"]
+
+
+def legacy_hook(site_dir: Path) -> Path | None:
+    """The sitecustomize.py an earlier version wrote, if it is still there."""
+    path = site_dir / "sitecustomize.py"
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    return path if text.strip() == LEGACY_HOOK.strip() else None
+
 
-        site_packages_path = sysconfig.get_path("purelib")
+def install(site_dir: Path) -> None:
+    uninstall(site_dir)
+    pth, module = hook_files(site_dir)
+    module.write_text(HOOK_MODULE, encoding="utf-8")
+    pth.write_text(PTH, encoding="utf-8")
 
-    if not site_packages_path:
+
+def uninstall(site_dir: Path) -> list[Path]:
+    """Remove the hook, and any legacy one; return the files removed."""
+    removed = [path for path in hook_files(site_dir) if path.exists()]
+    legacy = legacy_hook(site_dir)
+    if legacy is not None:
+        removed.append(legacy)
+    for path in removed:
+        path.unlink()
+    return removed
+
+
+def is_installed(site_dir: Path) -> bool:
+    return all(path.exists() for path in hook_files(site_dir))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=("install", "uninstall", "status"),
+        default="install",
+        help="What to do (default: install). status exits 1 if the hook is missing.",
+    )
+    args = parser.parse_args(argv)
+
+    site_dir = site_packages()
+    if site_dir is None:
         print("Could not find site-packages directory.", file=sys.stderr)
-        return
+        return 1
 
-    # Define the path for our custom file
-    customizer_path = Path(site_packages_path) / "sitecustomize.py"
+    if args.command == "status":
+        installed = is_installed(site_dir)
+        print(f"rich traceback hook: {'installed' if installed else 'not installed'}")
+        for path in hook_files(site_dir):
+            print(f"  {path}{'' if path.exists() else ' (missing)'}")
+        legacy = legacy_hook(site_dir)
+        if legacy is not None:
+            print(f"  {legacy} imports rich on every start; run install to replace it")
+        return 0 if installed else 1
 
-    # Write the rich hook, creating or overwriting the file
     try:
-        customizer_path.write_text(RICH_HOOK)
-        print(f"Successfully wrote rich hook to {customizer_path}")
-    except Exception as e:
-        print(f"Error writing to {customizer_path}: {e}", file=sys.stderr)
+        if args.command == "install":
+            install(site_dir)
+            print(f"Installed the rich traceback hook in {site_dir}")
+        else:
+            removed = uninstall(site_dir)
+            for path in removed:
+                print(f"Removed {path}")
+            if not removed:
+                print(f"No rich traceback hook in {site_dir}")
+    except OSError as e:
+        print(f"Error updating {site_dir}: {e}", file=sys.stderr)
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Snapshot the template's working tree so it can be rendered without a git clone.
+
+Passing the repository with vcs_ref="HEAD" makes copier clone it for every
+render. Rendering from a plain directory skips that entirely, so tests and
+tools snapshot the working tree once and render from the copy.
+
+Usage:
+    python scripts/template_snapshot.py DESTINATION [--committed-only]
+"""
+
+import argparse
+import io
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Paths (relative to the repository root) whose contents affect a render.
+TEMPLATE_INPUTS = ("copier.yaml", "extensions", "template")
+
+
+def working_tree_files(root: Path) -> list[str]:
+    """List tracked files plus untracked ones that .gitignore does not exclude."""
+    result = subprocess.run(
+        ["git", "ls-files", "--cached", "--others", "--exclude-standard", "-z"],
+        cwd=root,
+        check=True,
+        capture_output=True,
+    )
+    return sorted({name for name in result.stdout.decode().split("\0") if name})
+
+
+def export_ref(
+    root: Path, ref: str, destination: Path, paths: Iterable[str] = ()
+) -> Path:
+    """
+    Export the tree at a git ref into `destination`, limited to `paths` if given.
+
+    This only reads the local object database, so it works on any commit the
+    repository already has, without a checkout or network access.
+    """
+    destination.mkdir(parents=True, exist_ok=True)
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", ref, "--", *paths],
+        cwd=root,
+        check=True,
+        capture_output=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(destination, filter="data")
+    return destination
+
+
+def snapshot_template(
+    root: Path = ROOT, destination: Path | None = None, committed_only: bool = False
+) -> Path:
+    """
+    Copy the template into `destination` (a new temporary directory by default).
+
+    By default the snapshot mirrors the working tree, including uncommitted and
+    untracked edits, minus anything .gitignore excludes. With committed_only, it
+    is an export of HEAD instead, matching what vcs_ref="HEAD" would render.
+    The snapshot should be treated as read-only; file modes are kept as-is
+    because copier carries them over to the generated project.
+    """
+    if destination is None:
+        destination = Path(tempfile.mkdtemp(prefix="template-snapshot-"))
+    destination.mkdir(parents=True, exist_ok=True)
+
+    if committed_only:
+        return export_ref(root, "HEAD", destination)
+
+    for name in working_tree_files(root):
+        source = root / name
+        # Files deleted in the working tree are still listed while tracked.
+        if not source.is_file():
+            continue
+        target = destination / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target)
+    return destination
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Write a snapshot to the given directory."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("destination", type=Path, help="Directory to write to.")
+    parser.add_argument(
+        "--committed-only",
+        action="store_true",
+        help="Snapshot HEAD, ignoring uncommitted edits.",
+    )
+    args = parser.parse_args(argv)
+    path = snapshot_template(
+        destination=args.destination, committed_only=args.committed_only
+    )
+    print(f"Template snapshot written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Regenerate the pre-resolved pdm.lock files in template/locks/.
+
+Every distinct dependency profile (see `dependency_profile` in
+extensions/context.py) gets one lock. It is resolved by rendering a project
+with answers that produce the profile and running `pdm lock` in it, so the lock
+matches that pyproject.toml exactly. Locks that no profile produces any more
+are stale and are deleted.
+
+With --named, only the profiles of the answer sets in answer_profiles.py are
+locked; those are the locks shipped in the repository.
+
+Usage:
+    python scripts/update_locks.py [--workers 4] [--named] [--check]
+"""
+
+import argparse
+import itertools
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+from answer_matrix import BASE_ANSWERS, load_questions
+from answer_profiles import PROFILES, profile_answers
+from copier import run_copy
+from template_snapshot import snapshot_template
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from extensions.context import (  # noqa: E402
+    LOCK_DIR,
+    dependency_profile,
+    lock_key,
+)
+
+# The answers the TOOLS conditions read, which are all that shape a profile.
+DEPENDENCY_QUESTIONS = (
+    "cli",
+    "config_library",
+    "use_safety",
+    "use_bandit",
+    "use_semantic_release",
+    "use_docs",
+    "use_mkdocstrings",
+    "use_benchmarks",
+)
+# The python_version answers locks are shipped for. Other versions resolve.
+PYTHON_VERSIONS = ("3.13",)
+
+
+def dependency_profiles(
+    python_versions: tuple[str, ...] = PYTHON_VERSIONS,
+) -> dict[str, dict[str, Any]]:
+    """Map every reachable profile's lock key to answers that produce it."""
+    questions = [
+        question for question in load_questions() if question.name in DEPENDENCY_QUESTIONS
+    ]
+    profiles: dict[str, dict[str, Any]] = {}
+    for python_version in python_versions:
+        domains = [question.choices for question in questions]
+        for values in itertools.product(*domains):
+            answers = {
+                "python_version": python_version,
+                **{q.name: v for q, v in zip(questions, values, strict=True)},
+            }
+            profiles.setdefault(lock_key(dependency_profile(answers)), answers)
+    return profiles
+
+
+def named_profiles() -> dict[str, dict[str, Any]]:
+    """Map the lock key of each profile in answer_profiles.py to its answers."""
+    defaults = {question.name: question.choices[0] for question in load_questions()}
+    return {
+        lock_key(dependency_profile({**defaults, **profile_answers(name)})): (
+            profile_answers(name)
+        )
+        for name in PROFILES
+    }
+
+
+def shipped_locks() -> dict[str, Path]:
+    """The locks in template/locks/, by key."""
+    return {
+        path.name.removesuffix(".pdm.lock"): path
+        for path in sorted(LOCK_DIR.glob("*.pdm.lock"))
+    }
+
+
+def stale_locks(profiles: dict[str, dict[str, Any]]) -> list[Path]:
+    """Shipped locks for profiles that no set of answers produces any more."""
+    return [path for key, path in shipped_locks().items() if key not in profiles]
+
+
+def missing_locks(profiles: dict[str, dict[str, Any]]) -> list[str]:
+    return sorted(profiles.keys() - shipped_locks().keys())
+
+
+def resolve(answers: dict[str, Any], template: Path, workdir: Path) -> str:
+    """Render a project with these answers and lock its dependencies."""
+    data = {**BASE_ANSWERS, **answers, "installer": "pdm"}
+    run_copy(
+        str(template),
+        workdir,
+        data=data,
+        defaults=True,
+        skip_tasks=True,
+        unsafe=True,
+        quiet=True,
+    )
+    project_path = Path(workdir, data["project_slug"])
+    # Resolve from scratch rather than starting from the lock being replaced.
+    (project_path / "pdm.lock").unlink(missing_ok=True)
+    subprocess.run(
+        [sys.executable, "-m", "pdm", "lock", "-G", ":all"],
+        cwd=project_path,
+        check=True,
+        capture_output=True,
+        env={**os.environ, "PDM_USE_UV": "false"},
+    )
+    return (project_path / "pdm.lock").read_text(encoding="utf-8")
+
+
+def update_locks(
+    profiles: dict[str, dict[str, Any]], workers: int | None = None
+) -> list[str]:
+    """Write a fresh lock for every profile; return the keys that failed."""
+    failed = []
+    with tempfile.TemporaryDirectory(prefix="locks-") as tmp:
+        template = snapshot_template(ROOT, Path(tmp) / "template")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(resolve, answers, template, Path(tmp) / key): key
+                for key, answers in profiles.items()
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    lock = future.result()
+                except subprocess.CalledProcessError as e:
+                    print(f"  {key}: pdm lock failed\n{e.stderr.decode()}")
+                    failed.append(key)
+                    continue
+                (LOCK_DIR / f"{key}.pdm.lock").write_text(lock, encoding="utf-8")
+                print(f"  {key}: locked")
+                shutil.rmtree(Path(tmp) / key, ignore_errors=True)
+    return failed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Number of concurrent `pdm lock` runs."
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report stale and missing locks; exit 1 if any lock is stale.",
+    )
+    parser.add_argument(
+        "--named",
+        action="store_true",
+        help="Only lock the profiles of the answer sets in answer_profiles.py.",
+    )
+    args = parser.parse_args(argv)
+
+    profiles = dependency_profiles()
+    stale = stale_locks(profiles)
+    if args.named:
+        profiles = named_profiles()
+    missing = missing_locks(profiles)
+    print(
+        f"{len(profiles)} dependency profiles: {len(missing)} without a lock, "
+        f"{len(stale)} stale locks."
+    )
+    if args.check:
+        for path in stale:
+            print(f"  stale: {path.relative_to(ROOT)}")
+        return 1 if stale else 0
+
+    for path in stale:
+        path.unlink()
+    failed = update_locks(profiles, args.workers)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
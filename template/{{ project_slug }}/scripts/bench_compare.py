@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Run the benchmarks and compare them with tests/benchmarks/baseline.json.
+
+Each benchmark's fastest round (pytest-benchmark's "min") is compared with the
+baseline, and any benchmark more than --threshold percent slower fails the run.
+New benchmarks are reported without failing it. The first run, and any run with
+--update, saves the results as the baseline; commit the file.
+
+Usage:
+    python scripts/bench_compare.py [--threshold 25] [--update] [-- pytest args]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BENCHMARK_DIR = ROOT / "tests" / "benchmarks"
+BASELINE_PATH = BENCHMARK_DIR / "baseline.json"
+
+
+def run_benchmarks(pytest_args: list[str]) -> dict[str, float] | None:
+    """The fastest round of each benchmark, in seconds; None if pytest failed."""
+    with tempfile.TemporaryDirectory() as tmp:
+        results = Path(tmp) / "results.json"
+        command = [
+            sys.executable,
+            "-m",
+            "pytest",
+            str(BENCHMARK_DIR),
+            "--benchmark-enable",
+            "--benchmark-only",
+            "--no-cov",
+            f"--benchmark-json={results}",
+            *pytest_args,
+        ]
+        if subprocess.run(command, cwd=ROOT).returncode != 0:
+            return None
+        data = json.loads(results.read_text(encoding="utf-8"))
+    return {bench["fullname"]: bench["stats"]["min"] for bench in data["benchmarks"]}
+
+
+def regressions(
+    baseline: dict[str, float], current: dict[str, float], threshold: float
+) -> list[str]:
+    """Print how each benchmark compares; return those slower than the threshold."""
+    slower = []
+    for name, seconds in sorted(current.items()):
+        if name not in baseline:
+            print(f"  new      {seconds * 1e6:12.2f} us  {name}")
+            continue
+        change = (seconds / baseline[name] - 1) * 100
+        status = "SLOWER" if change > threshold else "ok"
+        print(f"  {status:<8} {seconds * 1e6:12.2f} us  {change:+7.1f}%  {name}")
+        if change > threshold:
+            slower.append(name)
+    return slower
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=25.0,
+        help="Percentage a benchmark may exceed its baseline before failing.",
+    )
+    parser.add_argument(
+        "--update", action="store_true", help="Save the results as the new baseline."
+    )
+    parser.add_argument("pytest_args", nargs="*", help="Extra arguments for pytest.")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.pytest_args)
+    if current is None:
+        return 1
+    if args.update or not BASELINE_PATH.exists():
+        BASELINE_PATH.write_text(
+            json.dumps(current, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        print(f"Saved {len(current)} benchmarks to {BASELINE_PATH.relative_to(ROOT)}")
+        return 0
+
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    print(f"Compared with {BASELINE_PATH.relative_to(ROOT)}:")
+    slower = regressions(baseline, current, args.threshold)
+    if slower:
+        print(f"{len(slower)} benchmarks are over {args.threshold}% slower.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
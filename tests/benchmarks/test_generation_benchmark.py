@@ -0,0 +1,167 @@
+"""
+Template generation benchmarks.
+
+Times run_copy for a fixed set of answer profiles, rendering from the session's
+template snapshot so git clone time is not included. Each round renders in a fresh
+interpreter so that the recorded peak RSS belongs to that render alone. Importing
+copier accounts for most of that peak, so the growth of the peak during the
+render itself is recorded separately as render_rss_mb. Measurements are compared
+with baseline.json: a profile fails when its wall time grows by more than
+--benchmark-threshold percent, or its render RSS by more than RSS_TOLERANCE_MB
+(a few MiB, where a percentage would only measure noise).
+
+    pytest tests/benchmarks --benchmark
+    pytest tests/benchmarks --benchmark --update-benchmark-baseline
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+from answer_profiles import PROFILES, profile_answers
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / "scripts"
+ROUNDS = 3
+# Metrics checked against the threshold; the rest are recorded for context.
+GATED_METRICS = ("wall_seconds",)
+# How far render_rss_mb may exceed its baseline, in MiB.
+RSS_TOLERANCE_MB = 10.0
+
+
+def peak_rss_mb() -> float:
+    """This process's peak resident set size so far, in MiB (0 where unknown)."""
+    # On Linux ru_maxrss survives exec, so a worker would report the peak of the
+    # pytest process it was forked from; VmHWM starts again with the new image.
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text(encoding="utf-8").splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return 0.0
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+    return peak_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def measure_render(template_path: str, data: dict[str, Any]) -> dict[str, float]:
+    """Render once in this process and report time, peak RSS and files written."""
+    from copier import run_copy
+
+    imported_rss_mb = peak_rss_mb()
+    with tempfile.TemporaryDirectory(prefix="bench-") as destination:
+        started = time.perf_counter()
+        run_copy(
+            template_path,
+            destination,
+            data=data,
+            defaults=True,
+            skip_tasks=True,
+            unsafe=True,
+            quiet=True,
+        )
+        wall_seconds = time.perf_counter() - started
+        files = sum(1 for path in Path(destination).rglob("*") if path.is_file())
+
+    peak = peak_rss_mb()
+    return {
+        "wall_seconds": wall_seconds,
+        "peak_rss_mb": peak,
+        "render_rss_mb": peak - imported_rss_mb,
+        "files": files,
+    }
+
+
+def run_profile(template_path: str, data: dict[str, Any]) -> dict[str, float]:
+    """Take the best of several isolated rounds to damp scheduler noise."""
+    # The worker re-imports this module, which needs scripts/ on its path.
+    env = {**os.environ, "PYTHONPATH": str(SCRIPTS_DIR)}
+    rounds = []
+    for _ in range(ROUNDS):
+        result = subprocess.run(
+            [sys.executable, __file__, template_path, json.dumps(data)],
+            check=True,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            env=env,
+        )
+        rounds.append(json.loads(result.stdout.splitlines()[-1]))
+    return {
+        "wall_seconds": round(min(r["wall_seconds"] for r in rounds), 3),
+        "peak_rss_mb": round(min(r["peak_rss_mb"] for r in rounds), 1),
+        "render_rss_mb": round(min(r["render_rss_mb"] for r in rounds), 1),
+        "files": rounds[0]["files"],
+    }
+
+
+def load_baseline() -> dict[str, dict[str, float]]:
+    if BASELINE_PATH.exists():
+        baseline: dict[str, dict[str, float]] = json.loads(
+            BASELINE_PATH.read_text(encoding="utf-8")
+        )
+        return baseline
+    return {}
+
+
+def test_baseline_covers_every_profile() -> None:
+    missing = sorted(PROFILES.keys() - load_baseline().keys())
+    assert not missing, (
+        f"No baseline for {missing}: run pytest tests/benchmarks --benchmark "
+        "--update-benchmark-baseline"
+    )
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("profile", list(PROFILES))
+def test_generation_benchmark(
+    profile: str, template_path: str, request: pytest.FixtureRequest
+) -> None:
+    measured = run_profile(template_path, profile_answers(profile))
+    print(f"\n{profile}: {json.dumps(measured)}")
+
+    baseline = load_baseline()
+    if request.config.getoption("--update-benchmark-baseline"):
+        baseline[profile] = measured
+        BASELINE_PATH.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        return
+
+    expected = baseline.get(profile)
+    if expected is None:
+        pytest.skip(f"No baseline for '{profile}'; run with --update-benchmark-baseline")
+
+    threshold = request.config.getoption("--benchmark-threshold")
+    regressions = []
+    for metric in GATED_METRICS:
+        if expected[metric] and measured[metric] > expected[metric] * (
+            1 + threshold / 100
+        ):
+            change = (measured[metric] / expected[metric] - 1) * 100
+            regressions.append(
+                f"{metric}: {measured[metric]} vs baseline {expected[metric]} "
+                f"(+{change:.0f}%, threshold {threshold}%)"
+            )
+    rss_growth = measured["render_rss_mb"] - expected["render_rss_mb"]
+    if rss_growth > RSS_TOLERANCE_MB:
+        regressions.append(
+            f"render_rss_mb: {measured['render_rss_mb']} vs baseline "
+            f"{expected['render_rss_mb']} (+{rss_growth:.1f} MiB, "
+            f"tolerance {RSS_TOLERANCE_MB} MiB)"
+        )
+    assert not regressions, f"'{profile}' regressed: " + "; ".join(regressions)
+
+
+if __name__ == "__main__":
+    # Worker mode, used by run_profile: <template_path> <answers as JSON>
+    print(json.dumps(measure_render(sys.argv[1], json.loads(sys.argv[2]))))
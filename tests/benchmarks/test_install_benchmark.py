@@ -0,0 +1,77 @@
+"""
+Cold and warm install benchmarks for the default profile.
+
+For each installer, the rendered project is installed with an empty package
+cache and no lock file (resolving, downloading and building everything), then
+again after deleting only .venv, so the second run reuses the lock file and the
+cache. pdm and pdm+uv projects ship with the pre-resolved lock from
+template/locks/, so for them a first cold install from that lock, with its own
+empty cache, is timed as well, before the lock is deleted. The installs need
+network access, so the timings are printed rather than compared with a
+baseline.
+
+    pytest tests/benchmarks/test_install_benchmark.py --benchmark -s
+"""
+
+import json
+import shutil
+import subprocess
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+from answer_profiles import profile_answers
+from installers import INSTALLERS, install_command, installer_env, missing_tools
+
+RenderProject = Callable[[dict[str, Any]], Path]
+
+
+def timed_install(installer: str, project_path: Path, cache_dir: Path) -> float:
+    """Install the project into .venv with a private cache; return the seconds."""
+    env = {
+        **installer_env(installer),
+        "PDM_CACHE_DIR": str(cache_dir / "pdm"),
+        "UV_CACHE_DIR": str(cache_dir / "uv"),
+    }
+    started = time.perf_counter()
+    subprocess.run(
+        install_command(installer),
+        cwd=project_path,
+        check=True,
+        timeout=600,
+        capture_output=True,
+        env=env,
+    )
+    return time.perf_counter() - started
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("installer", INSTALLERS)
+def test_install_benchmark(
+    installer: str, render_project: RenderProject, tmp_path: Path
+) -> None:
+    missing = missing_tools(installer)
+    if missing:
+        pytest.skip(f"'{installer}' needs {', '.join(missing)}")
+    data = {**profile_answers("defaults"), "installer": installer}
+    project_path = Path(
+        shutil.copytree(render_project(data), tmp_path / "project", symlinks=True)
+    )
+    cache_dir = tmp_path / "cache"
+
+    measured: dict[str, float] = {}
+    shipped_lock = project_path / "pdm.lock"
+    if shipped_lock.exists():
+        locked = timed_install(installer, project_path, tmp_path / "locked-cache")
+        measured["cold_locked_seconds"] = round(locked, 3)
+        shutil.rmtree(project_path / ".venv")
+        shipped_lock.unlink()
+    cold = timed_install(installer, project_path, cache_dir)
+    shutil.rmtree(project_path / ".venv")
+    warm = timed_install(installer, project_path, cache_dir)
+
+    measured |= {"cold_seconds": round(cold, 3), "warm_seconds": round(warm, 3)}
+    print(f"\ninstall ({installer}): {json.dumps(measured)}")
+    assert warm < cold, f"A warm '{installer}' install was no faster: {measured}"
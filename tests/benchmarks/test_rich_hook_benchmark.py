@@ -0,0 +1,50 @@
+"""
+Interpreter startup time with and without the rich traceback hook.
+
+`python -c pass` is timed in a venv with no hook, with the excepthook shim
+scripts/install_rich_hook.py installs, and with the sitecustomize.py it used to
+write, which imported rich on every start. The shim has to start faster than
+the legacy hook.
+
+    pytest tests/benchmarks/test_rich_hook_benchmark.py --benchmark -s
+"""
+
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+from install_rich_hook import LEGACY_HOOK, install, uninstall
+from venvs import make_venv, site_packages
+
+RUNS = 20
+
+
+def startup_time(python: Path) -> float:
+    """The fastest of RUNS interpreter starts, in seconds."""
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        subprocess.run([python, "-c", "pass"], check=True)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+@pytest.mark.benchmark
+def test_rich_hook_startup_benchmark(tmp_path: Path) -> None:
+    python = make_venv(tmp_path / "venv")
+    site_dir = site_packages(python)
+
+    baseline = startup_time(python)
+    install(site_dir)
+    shim = startup_time(python)
+    uninstall(site_dir)
+    (site_dir / "sitecustomize.py").write_text(LEGACY_HOOK)
+    legacy = startup_time(python)
+
+    print(
+        f"\nstartup: {baseline * 1000:.1f} ms without a hook, "
+        f"{shim * 1000:.1f} ms with the shim, "
+        f"{legacy * 1000:.1f} ms with the legacy sitecustomize.py"
+    )
+    assert shim < legacy
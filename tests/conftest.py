@@ -1,6 +1,138 @@
+import gc
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tomllib
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 import pytest
+from copier import run_copy
+from extensions.profiling import ENV_VAR as PROFILE_ENV_VAR
+from extensions.profiling import summarize
+from fake_cli import FakeCli
+from template_snapshot import TEMPLATE_INPUTS, snapshot_template
+
+VENV_BIN = "Scripts" if os.name == "nt" else "bin"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--offline-venvs",
+        action="store_true",
+        default=False,
+        help=(
+            "Give generated projects a .venv cloned from a cached template venv "
+            "instead of running 'pdm install'. Only the first run needs network "
+            "access, to fill the wheelhouse."
+        ),
+    )
+    parser.addoption(
+        "--committed-template",
+        action="store_true",
+        default=False,
+        help="Render the template as committed at HEAD, ignoring uncommitted edits.",
+    )
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run the template generation benchmarks (tests/benchmarks).",
+    )
+    parser.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=25.0,
+        help="Percentage a benchmark may exceed its baseline before failing.",
+    )
+    parser.addoption(
+        "--update-benchmark-baseline",
+        action="store_true",
+        default=False,
+        help="Rewrite tests/benchmarks/baseline.json from the current measurements.",
+    )
+    parser.addoption(
+        "--update-golden",
+        action="store_true",
+        default=False,
+        help="Rewrite the golden manifests in tests/golden/ from fresh renders.",
+    )
+    parser.addoption(
+        "--render-profile",
+        metavar="DIR",
+        default=None,
+        help=(
+            "Profile every render (and bootstrap.py run) into DIR, bypassing the "
+            "render cache, and write DIR/summary.json at the end of the session."
+        ),
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    profile_dir = config.getoption("--render-profile")
+    if profile_dir:
+        os.environ[PROFILE_ENV_VAR] = str(Path(profile_dir).resolve())
+
+
+def pytest_terminal_summary(
+    terminalreporter: pytest.TerminalReporter, config: pytest.Config
+) -> None:
+    profile_dir = config.getoption("--render-profile")
+    if not profile_dir:
+        return
+    # Finalize reports whose Jinja environment is no longer referenced.
+    gc.collect()
+    summary = summarize(Path(profile_dir))
+    summary_path = Path(profile_dir) / "summary.json"
+    summary_path.write_text(json.dumps(summary, indent=2) + "\n")
+    terminalreporter.section("render profile")
+    for row in summary["phases"]:
+        terminalreporter.write_line(
+            f"{row['kind']:>9} {row['phase']:<12} {row['seconds']:8.3f}s"
+            f"  ({row['reports']} reports)"
+        )
+    terminalreporter.write_line(f"Summary written to {summary_path}")
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    # Benchmarks are slow and machine-dependent, so they only run on request.
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmarks run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
+def template_fingerprint(root: Path) -> str:
+    """
+    Hash every file that feeds a render so cached trees are invalidated
+    as soon as the template or copier.yaml changes.
+    """
+    digest = hashlib.sha256()
+    for name in TEMPLATE_INPUTS:
+        source = root / name
+        files = [source] if source.is_file() else sorted(source.rglob("*"))
+        for path in files:
+            if not path.is_file() or "__pycache__" in path.parts:
+                continue
+            digest.update(path.relative_to(root).as_posix().encode())
+            digest.update(b"\0")
+            digest.update(path.read_bytes())
+            digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def answers_key(data: dict[str, Any]) -> str:
+    """Build a stable cache key from an answers dict, independent of key order."""
+    normalized = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(normalized.encode()).hexdigest()[:16]
 
 
 @pytest.fixture(scope="session")
@@ -21,3 +153,230 @@ def common_data() -> dict[str, str]:
         "license": "MIT",
         "python_version": "3.13",
     }
+
+
+@pytest.fixture(scope="session")
+def template_path(
+    root_path: str,
+    request: pytest.FixtureRequest,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> str:
+    """
+    A snapshot of the template taken once per session, which tests render from
+    instead of having copier clone the repository for every run_copy call.
+    """
+    return str(
+        snapshot_template(
+            Path(root_path),
+            tmp_path_factory.mktemp("template"),
+            committed_only=request.config.getoption("--committed-template"),
+        )
+    )
+
+
+@pytest.fixture(scope="session")
+def render_project(
+    template_path: str, request: pytest.FixtureRequest
+) -> Callable[[dict[str, Any]], Path]:
+    """
+    Render the template once per distinct set of answers and reuse the result.
+
+    Rendered trees live in pytest's cache directory, keyed on the template
+    fingerprint and the normalized answers, so they survive across runs until
+    the template changes (or `pytest --cache-clear` is used). The returned
+    project path is shared between tests and must be treated as read-only;
+    copy it first if a test needs to modify the generated files.
+    """
+    cache_root = request.config.cache.mkdir("copier_renders")
+    fingerprint = template_fingerprint(Path(template_path))
+
+    # Renders from older versions of the template can never be hit again.
+    for stale in cache_root.iterdir():
+        if stale.name != fingerprint:
+            shutil.rmtree(stale, ignore_errors=True)
+    cache_dir = cache_root / fingerprint
+    cache_dir.mkdir(exist_ok=True)
+
+    # Profiled runs render every time, so each test contributes a report.
+    profiling = bool(request.config.getoption("--render-profile"))
+
+    def render(data: dict[str, Any]) -> Path:
+        destination_path = cache_dir / answers_key(data)
+        if profiling or not destination_path.exists():
+            # Render into a private directory first so an interrupted run
+            # never leaves a half-written tree behind in the cache.
+            staging_path = cache_dir / f"{destination_path.name}.{os.getpid()}.tmp"
+            shutil.rmtree(staging_path, ignore_errors=True)
+            run_copy(
+                template_path,
+                staging_path,
+                data=data,
+                defaults=True,
+                skip_tasks=True,
+                unsafe=True,
+                quiet=True,
+            )
+            try:
+                staging_path.rename(destination_path)
+            except OSError:
+                # Another session rendered the same answers concurrently.
+                shutil.rmtree(staging_path, ignore_errors=True)
+        return destination_path / str(data["project_slug"])
+
+    return render
+
+
+def dependency_specs(project_path: Path) -> list[str]:
+    """
+    Collect every requirement a generated project installs with `pdm install -G :all`.
+
+    These are the rendered project_tools, doc_tools and dev_tools lists, so two
+    projects with the same specs can share one environment.
+    """
+    pyproject = tomllib.loads((project_path / "pyproject.toml").read_text())
+    project = pyproject.get("project", {})
+    specs = set(project.get("dependencies", []))
+    for group in project.get("optional-dependencies", {}).values():
+        specs.update(group)
+    dev_groups = pyproject.get("tool", {}).get("pdm", {}).get("dev-dependencies", {})
+    # Projects that install with uv declare them as PEP 735 dependency groups.
+    dev_groups = {**dev_groups, **pyproject.get("dependency-groups", {})}
+    for group in dev_groups.values():
+        specs.update(group)
+    return sorted(specs)
+
+
+def _link_or_copy(source: str, destination: str) -> None:
+    """Hard-link a file into a cloned venv, copying when linking is impossible."""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def clone_venv(template_venv: Path, venv_path: Path) -> None:
+    """
+    Clone a venv by hard-linking its files, then re-point the few files that
+    embed the venv's own location (pyvenv.cfg, script shebangs, activators).
+    """
+    shutil.copytree(template_venv, venv_path, symlinks=True, copy_function=_link_or_copy)
+    old, new = str(template_venv).encode(), str(venv_path).encode()
+    bin_dir = venv_path / VENV_BIN
+    candidates = [venv_path / "pyvenv.cfg", *bin_dir.iterdir()]
+    for path in candidates:
+        if path.is_symlink() or not path.is_file():
+            continue
+        content = path.read_bytes()
+        if old in content:
+            # Break the hard link before rewriting so the template stays intact.
+            path.unlink()
+            path.write_bytes(content.replace(old, new))
+            shutil.copymode(template_venv / path.relative_to(venv_path), path)
+
+
+def find_python(version: str) -> str | None:
+    """The path of a working `python<version>` interpreter, or None."""
+    if f"{sys.version_info.major}.{sys.version_info.minor}" == version:
+        return sys.executable
+    candidate = shutil.which(f"python{version}")
+    if candidate is None:
+        return None
+    # pyenv shims exist for every installed version but fail outside it.
+    check = subprocess.run(
+        [candidate, "-c", "import sys; print(sys.executable)"],
+        capture_output=True,
+        text=True,
+    )
+    return check.stdout.strip() if check.returncode == 0 else None
+
+
+def requested_python(project_path: Path) -> str:
+    """The Python version a generated project asks for (its python_version answer)."""
+    pyproject = tomllib.loads((project_path / "pyproject.toml").read_text())
+    return str(pyproject["project"]["requires-python"]).removeprefix(">=")
+
+
+@pytest.fixture(scope="session")
+def provision_venv(request: pytest.FixtureRequest) -> Callable[[Path], None]:
+    """
+    Give a generated project a ready-made .venv without resolving or downloading.
+
+    Wheels are collected into a shared wheelhouse, and for each interpreter and
+    distinct set of dependency specs a template venv is built once from it with
+    `--no-index`; both are kept in pytest's cache directory. The venv uses the
+    interpreter of the project's python_version answer, and the test is skipped
+    when that interpreter is not installed. Projects then receive a hard-linked
+    clone of that venv with the project itself installed editable, so its
+    [project.scripts] entry points exist too.
+    """
+    cache_root = request.config.cache.mkdir("offline_venvs")
+    wheelhouse = cache_root / "wheelhouse"
+
+    def install_offline(python: Path, *args: str | Path) -> None:
+        pip_install: list[str | Path] = [python, "-m", "pip", "install", "--no-index"]
+        subprocess.run(
+            [*pip_install, "--find-links", wheelhouse, *args],
+            check=True,
+            capture_output=True,
+        )
+
+    def build(interpreter: str, specs: list[str], template_venv: Path) -> None:
+        shutil.rmtree(template_venv, ignore_errors=True)
+        subprocess.run(
+            [interpreter, "-m", "venv", template_venv], check=True, capture_output=True
+        )
+        python = template_venv / VENV_BIN / "python"
+        try:
+            install_offline(python, *specs)
+        except subprocess.CalledProcessError:
+            # The wheelhouse is missing something: the only step that needs
+            # the network. Wheels already present are reused, not re-downloaded.
+            pip_wheel: list[str | Path] = [python, "-m", "pip", "wheel"]
+            pip_wheel += ["--find-links", wheelhouse]
+            subprocess.run(
+                [*pip_wheel, "--wheel-dir", wheelhouse, *specs],
+                check=True,
+                capture_output=True,
+            )
+            install_offline(python, *specs)
+
+    def provision(project_path: Path) -> None:
+        version = requested_python(project_path)
+        interpreter = find_python(version)
+        if interpreter is None:
+            pytest.skip(f"needs a python{version} interpreter for the project venv")
+        pyproject = tomllib.loads((project_path / "pyproject.toml").read_text())
+        # The build backend goes in the template venv, so the project can be
+        # installed below without build isolation, and so without the network.
+        build_requires = pyproject["build-system"]["requires"]
+        specs = sorted({*dependency_specs(project_path), *build_requires})
+        key = hashlib.sha256(json.dumps([version, specs]).encode()).hexdigest()[:16]
+        template_venv = cache_root / key
+        marker = cache_root / f"{key}.complete"
+        if not marker.exists():
+            build(interpreter, specs, template_venv)
+            marker.touch()
+
+        venv_path = project_path / ".venv"
+        clone_venv(template_venv, venv_path)
+        install_offline(
+            venv_path / VENV_BIN / "python",
+            "--no-deps",
+            "--no-build-isolation",
+            "-e",
+            project_path,
+        )
+
+    return provision
+
+
+@pytest.fixture
+def fake_cli(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> FakeCli:
+    """
+    Put fake gh, git, pdm, pre-commit and uv commands first on PATH, for this
+    process and its children. See tests/fake_cli.py for how they answer.
+    """
+    fake = FakeCli(tmp_path / "fake-cli")
+    for name, value in fake.install().items():
+        monkeypatch.setenv(name, value)
+    return fake
@@ -0,0 +1,161 @@
+"""
+A stand-in for gh, git, pdm, pre-commit and uv, so bootstrap.py runs offline.
+
+The `fake_cli` fixture (see conftest.py) puts a wrapper for each command on
+PATH that runs this file. Every invocation is logged to $FAKE_CLI_LOG. The
+response comes from the first rule in $FAKE_CLI_RULES whose `argv` starts the
+command line and which has not been used `times` times yet: it sleeps `delay`
+seconds, prints `stdout` and exits with `returncode`. Commands that match no
+rule succeed without output.
+"""
+
+import json
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypedDict
+
+COMMANDS = ("gh", "git", "pdm", "pre-commit", "uv")
+
+
+class Rule(TypedDict):
+    """How the fake commands answer the command lines starting with `argv`."""
+
+    argv: list[str]
+    stdout: str
+    returncode: int
+    delay: float
+    # None for no limit.
+    times: int | None
+
+
+# The answer to command lines that match no rule.
+DEFAULT_RULE = Rule(argv=[], stdout="", returncode=0, delay=0.0, times=None)
+
+
+@dataclass
+class Call:
+    """One invocation of a fake command."""
+
+    argv: list[str]
+    start: float
+    # Infinity until the command has finished.
+    end: float = math.inf
+    returncode: int | None = None
+
+
+def _records(log: Path) -> list[dict[str, Any]]:
+    if not log.exists():
+        return []
+    return [json.loads(line) for line in log.read_text().splitlines()]
+
+
+def _append(log: Path, record: dict[str, Any]) -> None:
+    # One short write per line, so concurrent commands don't interleave.
+    with log.open("a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+@dataclass
+class FakeCli:
+    """The fake commands on PATH, the rules they answer with and their log."""
+
+    root: Path
+    rules: list[Rule] = field(default_factory=list)
+
+    @property
+    def bin_dir(self) -> Path:
+        return self.root / "bin"
+
+    @property
+    def log(self) -> Path:
+        return self.root / "calls.jsonl"
+
+    @property
+    def rules_path(self) -> Path:
+        return self.root / "rules.json"
+
+    def install(self) -> dict[str, str]:
+        """Write the command wrappers; return the environment that selects them."""
+        self.bin_dir.mkdir(parents=True, exist_ok=True)
+        self.rules_path.write_text("[]")
+        for name in COMMANDS:
+            if os.name == "nt":
+                wrapper = self.bin_dir / f"{name}.cmd"
+                wrapper.write_text(f'@"{sys.executable}" "{__file__}" {name} %*\n')
+            else:
+                wrapper = self.bin_dir / name
+                wrapper.write_text(
+                    f'#!/bin/sh\nexec "{sys.executable}" "{__file__}" {name} "$@"\n'
+                )
+                wrapper.chmod(0o755)
+        return {
+            "PATH": f"{self.bin_dir}{os.pathsep}{os.environ['PATH']}",
+            "FAKE_CLI_LOG": str(self.log),
+            "FAKE_CLI_RULES": str(self.rules_path),
+        }
+
+    def respond(
+        self,
+        *argv: str,
+        stdout: str = "",
+        returncode: int = 0,
+        delay: float = 0.0,
+        times: int | None = None,
+    ) -> None:
+        """Answer command lines starting with `argv` (up to `times` times)."""
+        self.rules.append(
+            Rule(
+                argv=list(argv),
+                stdout=stdout,
+                returncode=returncode,
+                delay=delay,
+                times=times,
+            )
+        )
+        self.rules_path.write_text(json.dumps(self.rules))
+
+    def calls(self, *argv: str) -> list[Call]:
+        """The logged invocations whose command line starts with `argv`."""
+        calls: dict[str, Call] = {}
+        for record in _records(self.log):
+            if "argv" in record:
+                calls[record["id"]] = Call(record["argv"], record["start"])
+            else:
+                calls[record["id"]].end = record["end"]
+                calls[record["id"]].returncode = record["returncode"]
+        return [call for call in calls.values() if call.argv[: len(argv)] == list(argv)]
+
+
+def main(argv: list[str]) -> int:
+    log = Path(os.environ["FAKE_CLI_LOG"])
+    rules: list[Rule] = json.loads(Path(os.environ["FAKE_CLI_RULES"]).read_text())
+    used: dict[int, int] = {}
+    for record in _records(log):
+        if record.get("rule") is not None:
+            used[record["rule"]] = used.get(record["rule"], 0) + 1
+
+    index: int | None
+    index, rule = next(
+        (
+            (index, rule)
+            for index, rule in enumerate(rules)
+            if argv[: len(rule["argv"])] == rule["argv"]
+            and (rule["times"] is None or used.get(index, 0) < rule["times"])
+        ),
+        (None, DEFAULT_RULE),
+    )
+    call_id = f"{os.getpid()}-{time.time_ns()}"
+    _append(log, {"id": call_id, "argv": argv, "rule": index, "start": time.time()})
+    time.sleep(rule["delay"])
+    if rule["stdout"]:
+        print(rule["stdout"])
+    _append(log, {"id": call_id, "end": time.time(), "returncode": rule["returncode"]})
+    return rule["returncode"]
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,38 @@
+"""
+How tests install a generated project with each `installer` answer.
+
+pdm+uv projects need nothing beyond PDM itself: their generated pdm.toml is what
+switches PDM over to uv.
+"""
+
+import importlib.util
+import os
+import shutil
+import sys
+
+INSTALLERS = ("pdm", "pdm+uv", "uv")
+
+
+def install_command(installer: str) -> list[str]:
+    """The command that installs every dependency group with the chosen installer."""
+    if installer == "uv":
+        return ["uv", "sync", "--all-groups"]
+    return [sys.executable, "-m", "pdm", "install", "-G", ":all"]
+
+
+def installer_env(installer: str) -> dict[str, str]:
+    """The environment for commands run in a project made with `installer`."""
+    if installer == "pdm":
+        # PDM uses uv whenever it is configured globally; keep its own installer.
+        return {**os.environ, "PDM_USE_UV": "false"}
+    return dict(os.environ)
+
+
+def missing_tools(installer: str) -> list[str]:
+    """The commands an installer needs that are not available here."""
+    missing = []
+    if installer != "uv" and importlib.util.find_spec("pdm") is None:
+        missing.append("pdm")
+    if installer != "pdm" and shutil.which("uv") is None:
+        missing.append("uv")
+    return missing
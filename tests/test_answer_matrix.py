@@ -0,0 +1,80 @@
+import itertools
+
+import pytest
+from answer_matrix import (
+    Question,
+    covering_set,
+    load_questions,
+    normalize,
+    run_matrix,
+)
+from jinja2 import Environment
+
+
+def test_covering_set_covers_every_pair() -> None:
+    """Every pair of answers appears together in at least one row."""
+    questions = [
+        Question("a", (True, False)),
+        Question("b", ("x", "y", "z")),
+        Question("c", (1, 2)),
+        Question("d", (True, False)),
+    ]
+    rows = covering_set(questions)
+
+    # Far fewer rows than the full cartesian product of 24.
+    assert len(rows) < 12
+    for first, second in itertools.combinations(questions, 2):
+        for pair in itertools.product(first.choices, second.choices):
+            assert any((row[first.name], row[second.name]) == pair for row in rows), (
+                f"{first.name}/{second.name}={pair} is not covered"
+            )
+
+
+def test_covering_set_respects_when_conditions() -> None:
+    """Questions hidden by `when` are dropped, and their pairs are not forced."""
+    questions = [
+        Question("initialize_git", (False, True)),
+        Question("push_to_github", (True, False), when="{{ initialize_git }}"),
+        Question("cli", (False, True)),
+    ]
+    rows = covering_set(questions)
+
+    for row in rows:
+        if not row["initialize_git"]:
+            assert "push_to_github" not in row
+    assert any(row.get("push_to_github") is True and row["cli"] for row in rows)
+    assert any(row.get("push_to_github") is False and not row["cli"] for row in rows)
+
+
+def test_normalize_drops_inactive_answers() -> None:
+    questions = [
+        Question("use_dependabot", (True, False)),
+        Question("dependabot_automerge", (False, True), when="{{ use_dependabot }}"),
+    ]
+    row = {"use_dependabot": False, "dependabot_automerge": True}
+    assert normalize(row, questions, Environment()) == {"use_dependabot": False}
+
+
+def test_load_questions_reads_copier_yaml() -> None:
+    """Only user-facing questions with a finite domain are varied."""
+    questions = {question.name: question for question in load_questions()}
+
+    assert questions["task_runner"].choices == ("pdm", "just")
+    assert questions["cli"].choices == (False, True)
+    # Free-text questions and data-only variables are not part of the matrix.
+    assert "project_name" not in questions
+    assert "dev_tools" not in questions
+    assert "scripts" not in questions
+
+
+@pytest.mark.slow
+def test_pairwise_matrix_renders_cleanly(template_path: str) -> None:
+    """Render the all-pairs covering set and run the shared validators on it."""
+    results = run_matrix(covering_set(load_questions()), template=template_path)
+
+    failures = {
+        result.index: (result.answers, result.failures)
+        for result in results
+        if result.failures
+    }
+    assert not failures
@@ -0,0 +1,429 @@
+"""Tests for the step scheduler in the generated bootstrap.py."""
+
+import importlib.util
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from itertools import pairwise
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import pytest
+from answer_profiles import profile_answers
+from fake_cli import FakeCli
+
+RenderProject = Callable[[dict[str, Any]], Path]
+
+
+def load_bootstrap(project_path: Path) -> ModuleType:
+    """Import a rendered bootstrap.py without running main()."""
+    spec = importlib.util.spec_from_file_location(
+        "bootstrap", project_path / "bootstrap.py"
+    )
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def bootstrap(
+    render_project: RenderProject, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> ModuleType:
+    """The bootstrap module, run from an empty directory so its logs stay there."""
+    data = {**profile_answers("everything-on"), "push_to_github": True}
+    module = load_bootstrap(render_project(data))
+    monkeypatch.chdir(tmp_path)
+    return module
+
+
+def test_independent_steps_run_concurrently(bootstrap: ModuleType) -> None:
+    order: list[str] = []
+
+    def action(name: str, seconds: float) -> Callable[[], None]:
+        def run() -> None:
+            time.sleep(seconds)
+            order.append(name)
+
+        return run
+
+    steps = [
+        bootstrap.Step("slow", action("slow", 0.3)),
+        bootstrap.Step("fast", action("fast", 0.1)),
+        bootstrap.Step("after", action("after", 0), ("slow", "fast", "disabled")),
+    ]
+    started = time.perf_counter()
+    results = bootstrap.run_steps(steps)
+
+    assert time.perf_counter() - started < 0.55
+    assert order == ["fast", "slow", "after"]
+    assert {result.status for result in results.values()} == {"ok"}
+    # Needs on steps that are not scheduled are dropped.
+    assert results["after"].needs == ("slow", "fast")
+    assert results["after"].start >= results["slow"].start + 0.3
+
+
+def test_failure_skips_dependent_steps(bootstrap: ModuleType) -> None:
+    def fail() -> None:
+        sys.exit(1)
+
+    steps = [
+        bootstrap.Step("install", fail),
+        bootstrap.Step("qa", lambda: None, ("install",)),
+        bootstrap.Step("git-commit", lambda: None, ("qa", "git-init")),
+        bootstrap.Step("git-init", lambda: time.sleep(0.1)),
+        bootstrap.Step("pre-commit", lambda: None, ("git-init",)),
+    ]
+    results = bootstrap.run_steps(steps)
+
+    assert results["install"].status == "failed"
+    assert results["qa"].status == "skipped"
+    assert results["git-commit"].status == "skipped"
+    # Steps that do not depend on the failure still run.
+    assert results["git-init"].status == "ok"
+    assert results["pre-commit"].status == "ok"
+
+
+def test_bootstrap_graph(bootstrap: ModuleType) -> None:
+    steps = {step.name: step.needs for step in bootstrap.bootstrap_steps()}
+
+    assert steps["install"] == ()
+    assert steps["git-init"] == ()
+    assert steps["pre-commit"] == ("git-init",)
+    assert set(steps["git-commit"]) == {"git-init", "install", "qa", "pre-commit"}
+    assert set(steps["github"]) == {"github-auth", "git-commit"}
+    assert steps["project-board"] == ("github",)
+
+
+def test_bootstrap_profile_dir(
+    render_project: RenderProject, tmp_path: Path, fake_cli: FakeCli
+) -> None:
+    """--profile-dir, which the copier task passes, writes the step report there."""
+    project_path = Path(
+        shutil.copytree(
+            render_project(profile_answers("defaults")),
+            tmp_path / "project",
+            symlinks=True,
+        )
+    )
+    profile_dir = tmp_path / "profile"
+
+    subprocess.run(
+        [sys.executable, "bootstrap.py", "--profile-dir", str(profile_dir)],
+        cwd=project_path,
+        check=True,
+        capture_output=True,
+        env={key: value for key, value in os.environ.items() if key != "COPIER_PROFILE"},
+    )
+
+    (report_path,) = profile_dir.glob("bootstrap-*[0-9].json")
+    report = json.loads(report_path.read_text())
+    assert report["kind"] == "bootstrap"
+    assert report["phases"]
+
+
+def test_bootstrap_runs_git_while_installing(
+    render_project: RenderProject, tmp_path: Path, fake_cli: FakeCli
+) -> None:
+    data = {
+        **profile_answers("defaults"),
+        "run_qa_checks": True,
+        "precommit_install": True,
+        "initialize_git": True,
+        "push_to_github": False,
+    }
+    project_path = Path(
+        shutil.copytree(render_project(data), tmp_path / "project", symlinks=True)
+    )
+    fake_cli.respond("pdm", "install", delay=0.5)
+
+    subprocess.run(
+        [sys.executable, "bootstrap.py"],
+        cwd=project_path,
+        check=True,
+        capture_output=True,
+    )
+
+    (install,) = fake_cli.calls("pdm", "install")
+    (qa,) = fake_cli.calls("pdm", "run", "qa")
+    (git_init,) = fake_cli.calls("git", "init")
+    (pre_commit,) = fake_cli.calls("pre-commit", "install")
+    (commit,) = fake_cli.calls("git", "commit")
+    # git init and pre-commit install happen while pdm install is running...
+    assert git_init.end < install.end
+    assert pre_commit.start > git_init.end
+    assert pre_commit.end < install.end
+    # ...but the commit waits for the install and the QA run.
+    assert qa.start > install.end
+    assert commit.start > qa.end
+
+    timings = json.loads((project_path / ".bootstrap-timings.json").read_text())
+    assert {step["name"]: step["status"] for step in timings["steps"]} == {
+        "install": "ok",
+        "qa": "ok",
+        "git-init": "ok",
+        "pre-commit": "ok",
+        "git-commit": "ok",
+    }
+
+
+@pytest.mark.parametrize(
+    ("installer", "command", "qa_command"),
+    [
+        ("pdm", ("pdm", "install"), ("pdm", "run", "qa")),
+        ("pdm+uv", ("pdm", "install"), ("pdm", "run", "qa")),
+        # uv projects may not have PDM: uv runs it as a tool, as CI does.
+        ("uv", ("uv", "sync", "--all-groups"), ("uv", "tool", "run", "pdm", "run", "qa")),
+    ],
+)
+def test_bootstrap_installs_with_the_chosen_installer(
+    installer: str,
+    command: tuple[str, ...],
+    qa_command: tuple[str, ...],
+    render_project: RenderProject,
+    tmp_path: Path,
+    fake_cli: FakeCli,
+) -> None:
+    data = {
+        **profile_answers("defaults"),
+        "installer": installer,
+        "run_qa_checks": True,
+        "initialize_git": False,
+        "push_to_github": False,
+    }
+    project_path = Path(
+        shutil.copytree(render_project(data), tmp_path / "project", symlinks=True)
+    )
+
+    subprocess.run(
+        [sys.executable, "bootstrap.py"],
+        cwd=project_path,
+        check=True,
+        capture_output=True,
+    )
+
+    (install,) = fake_cli.calls(*command)
+    (qa,) = fake_cli.calls(*qa_command)
+    assert qa.start > install.end
+    assert [call.argv[0] for call in fake_cli.calls()] == [command[0], qa_command[0]]
+    # pdm+uv is plain `pdm install`: the project's pdm.toml switches on uv.
+    assert (project_path / "pdm.toml").exists() == (installer == "pdm+uv")
+
+
+def run_list(workflow: str) -> tuple[str, ...]:
+    return ("gh", "run", "list", "--workflow", workflow, "--branch", "main")
+
+
+def test_wait_for_workflow_run_backs_off(
+    bootstrap: ModuleType, fake_cli: FakeCli, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(bootstrap, "WORKFLOW_POLL_INITIAL", 0.05)
+    run = {"databaseId": 42, "url": "https://github.com/runs/42"}
+    fake_cli.respond(*run_list("main.yaml"), stdout="[]", times=3)
+    fake_cli.respond(*run_list("main.yaml"), stdout=json.dumps([run]))
+
+    assert bootstrap.wait_for_workflow_runs(["main.yaml"], "main", timeout=10) == {
+        "main.yaml": run
+    }
+
+    calls = fake_cli.calls("gh", "run", "list")
+    assert len(calls) == 4
+    # Only the latest run of one workflow, with only the fields that are used.
+    assert calls[0].argv[-4:] == ["--limit", "1", "--json", "databaseId,url"]
+    gaps = [later.start - earlier.end for earlier, later in pairwise(calls)]
+    assert gaps[0] >= 0.05
+    assert gaps[1] >= 0.1
+    assert gaps[2] >= 0.2
+
+
+def test_wait_for_workflow_runs_share_a_deadline(
+    bootstrap: ModuleType, fake_cli: FakeCli, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(bootstrap, "WORKFLOW_POLL_INITIAL", 0.1)
+    run = {"databaseId": 7, "url": "https://github.com/runs/7"}
+    fake_cli.respond(*run_list("main.yaml"), stdout="[]")
+    fake_cli.respond(*run_list("docs.yaml"), stdout=json.dumps([run]), delay=0.3)
+
+    started = time.time()
+    runs = bootstrap.wait_for_workflow_runs(["main.yaml", "docs.yaml"], "main", 1.0)
+    elapsed = time.time() - started
+
+    assert runs == {"main.yaml": None, "docs.yaml": run}
+    # Both waits ran at the same time, and the missing run gave up on time.
+    assert 1.0 <= elapsed < 2.0
+    (docs,) = fake_cli.calls(*run_list("docs.yaml"))
+    assert docs.start - started < 0.5
+
+
+def test_bootstrap_publishes_and_links_workflow_runs(
+    render_project: RenderProject, tmp_path: Path, fake_cli: FakeCli
+) -> None:
+    data = {
+        **profile_answers("defaults"),
+        "initialize_git": True,
+        "push_to_github": True,
+        "task_tracking": "None",
+        "github_username": "octocat",
+    }
+    project_path = Path(
+        shutil.copytree(render_project(data), tmp_path / "project", symlinks=True)
+    )
+    fake_cli.respond("gh", "auth", "status", stdout="Logged in as octocat")
+    fake_cli.respond("gh", "repo", "view", returncode=1)
+    fake_cli.respond("git", "branch", "--show-current", stdout="main")
+    run = {"databaseId": 1, "url": "https://github.com/octocat/test-project/runs/1"}
+    fake_cli.respond(*run_list("main.yaml"), stdout=json.dumps([run]))
+
+    result = subprocess.run(
+        [sys.executable, "bootstrap.py"],
+        cwd=project_path,
+        env={**os.environ, "_WORKFLOW_DEADLINE": "2"},
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    (create,) = fake_cli.calls("gh", "repo", "create")
+    (commit,) = fake_cli.calls("git", "commit")
+    assert create.start > commit.end
+    assert f"'main.yaml' is running: {run['url']}" in result.stdout
+    assert not fake_cli.calls(*run_list("docs.yaml"))
+
+
+@pytest.fixture
+def failed_bootstrap(
+    render_project: RenderProject, tmp_path: Path, fake_cli: FakeCli
+) -> Path:
+    """A project whose first bootstrap run failed in the QA step."""
+    data = {
+        **profile_answers("defaults"),
+        "run_qa_checks": True,
+        "precommit_install": True,
+        "initialize_git": True,
+        "push_to_github": False,
+    }
+    project_path = Path(
+        shutil.copytree(render_project(data), tmp_path / "project", symlinks=True)
+    )
+    fake_cli.respond("pdm", "run", "qa", returncode=1, times=1)
+    first = subprocess.run(
+        [sys.executable, "bootstrap.py"], cwd=project_path, capture_output=True
+    )
+    assert first.returncode == 1
+    assert (project_path / "bootstrap.py").exists()
+    state = json.loads((project_path / ".bootstrap-state.json").read_text())
+    assert set(state["steps"]) == {"install", "git-init", "pre-commit"}
+    return project_path
+
+
+def test_resume_skips_completed_steps(failed_bootstrap: Path, fake_cli: FakeCli) -> None:
+    result = subprocess.run(
+        [sys.executable, "bootstrap.py", "--resume"],
+        cwd=failed_bootstrap,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert len(fake_cli.calls("pdm", "install")) == 1
+    assert len(fake_cli.calls("git", "init")) == 1
+    assert len(fake_cli.calls("pdm", "run", "qa")) == 2
+    assert len(fake_cli.calls("git", "commit")) == 1
+    assert "install     done" in result.stdout
+    # Once everything succeeded, the script and its state are gone.
+    assert not (failed_bootstrap / "bootstrap.py").exists()
+    assert not (failed_bootstrap / ".bootstrap-state.json").exists()
+
+
+def test_resume_reruns_forced_and_changed_steps(
+    failed_bootstrap: Path, fake_cli: FakeCli
+) -> None:
+    pyproject = failed_bootstrap / "pyproject.toml"
+    pyproject.write_text(pyproject.read_text() + "\n# edited\n")
+
+    subprocess.run(
+        [sys.executable, "bootstrap.py", "--force", "pre-commit"],
+        cwd=failed_bootstrap,
+        capture_output=True,
+        check=True,
+    )
+
+    # pyproject.toml is an input of the install, pre-commit was forced.
+    assert len(fake_cli.calls("pdm", "install")) == 2
+    assert len(fake_cli.calls("pre-commit", "install")) == 2
+    assert len(fake_cli.calls("git", "init")) == 1
+
+
+def python_command(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+class TimedWrites(io.StringIO):
+    """A stdout replacement that remembers when each line was written."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.times: dict[str, float] = {}
+
+    def write(self, text: str) -> int:
+        self.times.setdefault(text.strip(), time.perf_counter())
+        return super().write(text)
+
+
+def test_run_command_streams_output(
+    bootstrap: ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    stdout = TimedWrites()
+    monkeypatch.setattr(sys, "stdout", stdout)
+    code = "import time; print('one', flush=True); time.sleep(0.5); print('two')"
+
+    with bootstrap.step("install"):
+        result = bootstrap.run_command(python_command(code))
+    finished = time.perf_counter()
+
+    # Each line shows up (prefixed with the step) as soon as it is printed.
+    assert finished - stdout.times["[install] one"] >= 0.4
+    assert "[install] two" in stdout.times
+    assert result.stdout == "one\ntwo\n"
+    log = (tmp_path / ".bootstrap-logs" / "install.log").read_text()
+    assert log.endswith("one\ntwo\n")
+
+
+def test_run_command_keeps_a_bounded_tail(
+    bootstrap: ModuleType, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    code = "import sys\nfor i in range(1000): print(f'line {i}')\nsys.exit(3)"
+
+    with pytest.raises(SystemExit), bootstrap.step("qa"):
+        bootstrap.run_command(python_command(code))
+
+    report = capsys.readouterr().out.split("exit code 3")[1]
+    assert f"Last {bootstrap.TAIL_LINES} lines of output" in report
+    assert "line 999" in report
+    assert f"line {999 - bootstrap.TAIL_LINES}\n" not in report
+    # The log has every line.
+    log = (tmp_path / ".bootstrap-logs" / "qa.log").read_text()
+    assert log.count("\nline ") == 1000
+
+
+def test_run_command_captures_parsed_output(
+    bootstrap: ModuleType, capsys: pytest.CaptureFixture[str]
+) -> None:
+    code = (
+        "import sys; print('warning: slow', file=sys.stderr); "
+        "print('[' + ','.join(['1'] * 100) + ']')"
+    )
+
+    with bootstrap.step("workflows"):
+        result = bootstrap.run_command(python_command(code), capture=True)
+
+    assert json.loads(result.stdout) == [1] * 100
+    out = capsys.readouterr().out
+    assert "[workflows] warning: slow" in out
+    assert "[1," not in out
@@ -0,0 +1,98 @@
+from extensions.context import TOOLS, Tool, build_context
+
+ANSWERS = {
+    "cli": False,
+    "config_library": "none",
+    "use_safety": False,
+    "use_bandit": False,
+    "use_semantic_release": False,
+    "use_docs": True,
+    "use_mkdocstrings": True,
+    "doc_hosting_provider": "None",
+    "include_adr": False,
+    "use_benchmarks": False,
+    "installer": "pdm",
+}
+
+
+def names(tools: list[Tool]) -> list[str]:
+    return [tool.name for tool in tools]
+
+
+def test_tools_are_grouped_in_registry_order() -> None:
+    """CLI tools are both project and dev dependencies, in registry order."""
+    context = build_context({**ANSWERS, "cli": True, "use_bandit": True})
+    assert names(context["project_tools"]) == ["typer[all]", "rich"]
+    assert names(context["dev_tools"]) == [
+        "pytest",
+        "pytest-cov",
+        "pytest-xdist",
+        "ruff",
+        "commitizen",
+        "mypy",
+        "typer[all]",
+        "rich",
+        "bandit",
+    ]
+    assert names(context["doc_tools"]) == [
+        "mkdocs",
+        "mkdocs-material",
+        "mkdocstrings[python]",
+    ]
+
+
+def test_qa_runs_every_selected_check() -> None:
+    """The composite qa task picks up optional checks, in task order."""
+    scripts = build_context({**ANSWERS, "use_safety": True})["scripts"]
+    assert list(scripts)[-1] == "qa"
+    assert scripts["qa"].composite == (
+        "format-check",
+        "lint",
+        "type-check",
+        "test",
+        "safety-check",
+    )
+    assert "bandit-check" not in scripts
+
+
+def test_context_is_built_once_per_answers() -> None:
+    """Renders of the same project share one context, whatever else is in it."""
+    first = build_context({**ANSWERS, "project_name": "One"})
+    second = build_context({**ANSWERS, "project_name": "Two"})
+    assert first is second
+    assert build_context({**ANSWERS, "use_docs": False})["doc_tools"] == []
+
+
+def test_registry_names_are_unique() -> None:
+    assert len({tool.name for tool in TOOLS}) == len(TOOLS)
+
+
+def test_docs_requirements_are_exported_by_the_installer() -> None:
+    """uv projects have no PDM lock to export the docs group from."""
+    answers = {**ANSWERS, "doc_hosting_provider": "Read the Docs"}
+    pdm = build_context(answers)["scripts"]["export-docs-reqs"]
+    uv = build_context({**answers, "installer": "uv"})["scripts"]["export-docs-reqs"]
+    assert pdm.cmd.startswith("pdm export --group docs")
+    assert uv.cmd.startswith("uv export --no-dev --group docs")
+
+
+def test_benchmarks_add_their_tasks_but_stay_out_of_qa() -> None:
+    context = build_context({**ANSWERS, "use_benchmarks": True})
+    assert "pytest-benchmark" in names(context["dev_tools"])
+    scripts = context["scripts"]
+    assert scripts["bench"].cmd.startswith("pytest tests/benchmarks")
+    assert scripts["bench-compare"].cmd == "python scripts/bench_compare.py"
+    assert "bench" not in scripts["qa"].composite
+    assert "bench" not in build_context(ANSWERS)["scripts"]
+
+
+def test_fast_tests_skip_coverage_and_slow_markers() -> None:
+    context = build_context(ANSWERS)
+    assert "pytest-xdist" in names(context["dev_tools"])
+    scripts = context["scripts"]
+    assert "--no-cov" in scripts["test-fast"].cmd
+    for marker in ("slow", "integration", "network"):
+        assert f"not {marker}" in scripts["test-fast"].cmd
+    assert "--no-cov" not in scripts["test-full"].cmd
+    assert scripts["qa"].composite.count("test") == 1
+    assert "test-fast" not in scripts["qa"].composite
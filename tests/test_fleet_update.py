@@ -0,0 +1,102 @@
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml  # type: ignore[import-untyped]
+from copier import run_copy
+from fleet_update import merge_file, update_fleet
+
+CONTRIBUTING = "template/{{ project_slug }}/CONTRIBUTING.md.jinja"
+
+
+def git(cwd: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def commit_all(cwd: Path, message: str) -> str:
+    git(cwd, "add", "-A")
+    git(cwd, "commit", "-q", "-m", message)
+    return git(cwd, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def template_repo(template_path: str, tmp_path: Path) -> Path:
+    """A throwaway git repository holding the template, with one commit."""
+    repo = tmp_path / "template-repo"
+    shutil.copytree(template_path, repo)
+    git(repo, "init", "-q")
+    commit_all(repo, "initial template")
+    return repo
+
+
+def generate(template_repo: Path, destination: Path, data: dict[str, Any]) -> Path:
+    """Generate a project from the template repository and commit it."""
+    run_copy(
+        str(template_repo),
+        destination,
+        data=data,
+        vcs_ref="HEAD",
+        defaults=True,
+        skip_tasks=True,
+        unsafe=True,
+        quiet=True,
+    )
+    project = destination / str(data["project_slug"])
+    (project / "bootstrap.py").unlink()
+    git(project, "init", "-q")
+    commit_all(project, "generated")
+    return project
+
+
+def test_merge_file_keeps_local_edits(tmp_path: Path) -> None:
+    """The template's change and a local change to other lines are both kept."""
+    base, ours, theirs = (tmp_path / name for name in ("base", "ours", "theirs"))
+    base.write_text("one\ntwo\nthree\n")
+    ours.write_text("one (local)\ntwo\nthree\n")
+    theirs.write_text("one\ntwo\nthree (template)\n")
+
+    merged, conflicted = merge_file(ours, base, theirs, "file")
+
+    assert not conflicted
+    assert merged == b"one (local)\ntwo\nthree (template)\n"
+
+
+def test_update_fleet_merges_changed_files(
+    template_repo: Path, tmp_path: Path, common_data: dict[str, str]
+) -> None:
+    """Template changes are merged into each repo, and conflicts are reported."""
+    clean = generate(template_repo, tmp_path / "clean", common_data)
+    edited = generate(template_repo, tmp_path / "edited", common_data)
+    contributing = edited / "CONTRIBUTING.md"
+    thanks = contributing.read_text().splitlines()[1]
+    contributing.write_text(contributing.read_text().replace(thanks, "Ours.", 1))
+    commit_all(edited, "local edit")
+
+    source = template_repo / CONTRIBUTING
+    source.write_text(source.read_text().replace(thanks, "Theirs.", 1))
+    (template_repo / "template/{{ project_slug }}/NEW.md").write_text("new file\n")
+    new_commit = commit_all(template_repo, "change the template")
+
+    results = update_fleet([clean, edited], template=template_repo, workers=2)
+
+    assert [result.status for result in results] == ["updated", "conflicts"]
+    assert sorted(results[0].updated) == ["CONTRIBUTING.md", "NEW.md"]
+    assert results[1].updated == ["NEW.md"]
+    assert results[1].conflicts == ["CONTRIBUTING.md"]
+    assert "Theirs." in (clean / "CONTRIBUTING.md").read_text()
+    assert "<<<<<<<" in contributing.read_text()
+    answers = yaml.safe_load((clean / ".copier-answers.yml").read_text())
+    assert answers["_commit"] == new_commit[:7]
+
+    # Only the commit changed, so a second run has nothing left to do.
+    commit_all(clean, "update")
+    (rerun,) = update_fleet([clean], template=template_repo, workers=1)
+    assert rerun.status == "up to date"
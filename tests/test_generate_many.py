@@ -0,0 +1,97 @@
+from pathlib import Path
+from typing import Any
+
+from generate_many import (
+    AnswerValidator,
+    ProjectResult,
+    bootstrap_project,
+    generate_many,
+    load_manifest,
+)
+
+
+def test_load_manifest_yaml_applies_defaults(tmp_path: Path) -> None:
+    """Shared defaults are merged under every project's own answers."""
+    manifest = tmp_path / "services.yaml"
+    manifest.write_text(
+        "defaults:\n"
+        "  task_runner: just\n"
+        "  cli: false\n"
+        "projects:\n"
+        "  - project_name: Billing Service\n"
+        "  - project_name: Ledger Service\n"
+        "    cli: true\n"
+    )
+    assert load_manifest(manifest) == [
+        {"task_runner": "just", "cli": False, "project_name": "Billing Service"},
+        {"task_runner": "just", "cli": True, "project_name": "Ledger Service"},
+    ]
+
+
+def test_load_manifest_csv_parses_cells(tmp_path: Path) -> None:
+    """CSV cells keep their YAML types and empty cells are left to the defaults."""
+    manifest = tmp_path / "services.csv"
+    manifest.write_text(
+        "project_name,cli,line_length,pytest_markers\n"
+        'Billing Service,true,120,"[unit, slow]"\n'
+        "Ledger Service,,,\n"
+    )
+    assert load_manifest(manifest) == [
+        {
+            "project_name": "Billing Service",
+            "cli": True,
+            "line_length": 120,
+            "pytest_markers": ["unit", "slow"],
+        },
+        {"project_name": "Ledger Service"},
+    ]
+
+
+def test_validator_uses_copier_yaml_validators() -> None:
+    """Answers are checked with the validators and choices from copier.yaml."""
+    validator = AnswerValidator()
+    assert validator.validate({"project_name": "Billing Service"}) == []
+
+    problems = validator.validate(
+        {"project_name": "abc", "project_slug": "Bad Slug", "task_runner": "make"}
+    )
+    assert any(p.startswith("project_name: project_name must be") for p in problems)
+    assert any(p.startswith("project_slug:") for p in problems)
+    assert any(p.startswith("task_runner: 'make' is not one of") for p in problems)
+
+
+def test_generate_many_renders_every_project(template_path: str, tmp_path: Path) -> None:
+    """Each answer set is rendered into its own project directory."""
+    manifest: list[dict[str, Any]] = [
+        {"project_name": "Billing Service"},
+        {"project_name": "Ledger Service", "cli": True, "task_runner": "just"},
+    ]
+    results = generate_many(manifest, tmp_path, workers=2, template=template_path)
+
+    assert [result.status for result in results] == ["ok", "ok"]
+    assert (tmp_path / "billing-service" / "pyproject.toml").is_file()
+    assert (tmp_path / "ledger-service" / "justfile").is_file()
+    assert not list(tmp_path.glob(".generate-many-*"))
+
+
+def test_generate_many_renders_nothing_if_any_set_is_invalid(
+    template_path: str, tmp_path: Path
+) -> None:
+    """One invalid answer set stops the whole batch before rendering."""
+    manifest = [{"project_name": "Billing Service"}, {"project_name": "abc"}]
+    results = generate_many(manifest, tmp_path, template=template_path)
+
+    assert [result.status for result in results] == ["skipped", "invalid"]
+    assert not (tmp_path / "billing-service").exists()
+
+
+def test_stuck_bootstrap_times_out(tmp_path: Path) -> None:
+    """A bootstrap.py that never finishes is killed and reported as failed."""
+    project = tmp_path / "stuck"
+    project.mkdir()
+    (project / "bootstrap.py").write_text("import time\ntime.sleep(60)\n")
+    result = ProjectResult(0, {"project_slug": "stuck"}, status="ok")
+    bootstrap_project(result, tmp_path, timeout=0.5)
+    assert result.status == "bootstrap failed"
+    assert result.problems == ["bootstrap.py timed out after 0.5s"]
+    assert result.bootstrap_seconds < 30
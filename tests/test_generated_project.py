@@ -3,12 +3,16 @@ import shutil
 import stat
 import subprocess
 import sys
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
 import copier.errors
 import pytest
 from copier import run_copy
+from installers import INSTALLERS, install_command, installer_env, missing_tools
+
+RenderProject = Callable[[dict[str, Any]], Path]
 
 
 def force_rmtree_onerror(func: Any, path: Any, exc_info: Any) -> None:
@@ -43,12 +47,54 @@ def get_run_command(task_runner: str, command: list[str]) -> list[str]:
         return [sys.executable, "-m", "pdm", "run", *command]
 
 
+def install_with_pdm(project_path: Path) -> None:
+    """Install a generated project's dependencies with PDM (pip installer)."""
+    try:
+        subprocess.run(
+            [sys.executable, "-m", "pdm", "install"],
+            cwd=project_path,
+            check=True,
+            timeout=300,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            env=installer_env("pdm"),
+        )
+    except FileNotFoundError:  # pragma: no cover
+        subprocess.run(
+            ["pdm", "install"],
+            cwd=project_path,
+            check=True,
+            timeout=300,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            env=installer_env("pdm"),
+        )
+    except subprocess.CalledProcessError as e:
+        print("\n--- [Inner PDM Install STDOUT] ---")
+        print(e.stdout)
+        print("--- [Inner PDM Install STDERR] ---")
+        print(e.stderr)
+        print("-------------------------------------------\n")
+        raise
+
+
+@pytest.mark.parametrize("installer", INSTALLERS)
 def test_generated_project(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    installer: str,
+    template_path: str,
+    tmp_path: Path,
+    common_data: dict[str, str],
+    request: pytest.FixtureRequest,
+    provision_venv: Callable[[Path], None],
 ) -> None:
     """
     Generate a project and run its install, test, and lint commands.
     """
+    missing = missing_tools(installer)
+    if missing:
+        pytest.skip(f"'{installer}' needs {', '.join(missing)}")
     destination_path = tmp_path
 
     # Get the task runner choice, defaulting to 'pdm' if not specified
@@ -56,16 +102,16 @@ def test_generated_project(
     data = {
         **common_data,
         "task_runner": task_runner,
+        "installer": installer,
         "initialize_git": True,
         "push_to_github": False,
     }
 
     try:
         run_copy(
-            root_path,
+            template_path,
             destination_path,
             data=data,
-            vcs_ref="HEAD",
             defaults=True,
             skip_tasks=True,
             unsafe=True,
@@ -82,23 +128,27 @@ def test_generated_project(
     # Use the alias 'test' defined in copier.yaml
     test_command = get_run_command(task_runner, ["test"])
     try:
-        try:
-            subprocess.run(
-                [sys.executable, "-m", "pdm", "install", "-G", ":all"],
-                cwd=project_path,
-                check=True,
-                timeout=300,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-            )
-        except subprocess.CalledProcessError as e:
-            print("\n--- [Inner Pytest STDOUT] ---")
-            print(e.stdout)
-            print("--- [Inner Pytest STDERR] ---")
-            print(e.stderr)
-            print("-------------------------------\n")
-            raise
+        if request.config.getoption("--offline-venvs"):
+            provision_venv(project_path)
+        else:
+            try:
+                subprocess.run(
+                    install_command(installer),
+                    cwd=project_path,
+                    check=True,
+                    timeout=300,
+                    capture_output=True,
+                    text=True,
+                    encoding="utf-8",
+                    env=installer_env(installer),
+                )
+            except subprocess.CalledProcessError as e:
+                print("\n--- [Inner Pytest STDOUT] ---")
+                print(e.stdout)
+                print("--- [Inner Pytest STDERR] ---")
+                print(e.stderr)
+                print("-------------------------------\n")
+                raise
 
         subprocess.run(
             test_command,
@@ -108,7 +158,7 @@ def test_generated_project(
             capture_output=True,
             text=True,
             encoding="utf-8",
-            env={**os.environ, "PDM_CONFIG_use_uv": "false"},
+            env=installer_env(installer),
         )
     except subprocess.CalledProcessError as e:
         print("\n--- [Inner Pytest STDOUT] ---")
@@ -163,7 +213,7 @@ def test_generated_project(
 
 @pytest.mark.integration
 def test_generated_project_github_creation(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    template_path: str, tmp_path: Path, common_data: dict[str, str]
 ) -> None:
     """
     Tests the full project generation *including* GitHub repo creation.
@@ -190,10 +240,9 @@ def test_generated_project_github_creation(
     try:
         # --- 1. Run Copier with tasks enabled ---
         run_copy(
-            root_path,
+            template_path,
             destination_path,
             data=data,
-            vcs_ref="HEAD",
             defaults=True,
             skip_tasks=False,  # This runs bootstrap.py
             unsafe=True,
@@ -229,7 +278,11 @@ def test_generated_project_github_creation(
 
 
 def test_generated_project_with_bandit(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    template_path: str,
+    tmp_path: Path,
+    common_data: dict[str, str],
+    request: pytest.FixtureRequest,
+    provision_venv: Callable[[Path], None],
 ) -> None:
     """
     Generate a project with bandit and run its security check.
@@ -243,10 +296,9 @@ def test_generated_project_with_bandit(
     }
     destination_path = tmp_path / "generated_project_bandit"
     run_copy(
-        root_path,
+        template_path,
         destination_path,
         data=data,
-        vcs_ref="HEAD",
         defaults=True,
         skip_tasks=True,
         unsafe=True,
@@ -265,36 +317,11 @@ def test_generated_project_with_bandit(
         env={**os.environ, "SKIP": "pre-commit-hooks"},
     )
 
-    # --- Install Dependencies (Always PDM) ---
-    try:
-        subprocess.run(
-            [sys.executable, "-m", "pdm", "install"],
-            cwd=project_path,
-            check=True,
-            timeout=300,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            env={**os.environ, "PDM_CONFIG_use_uv": "false"},
-        )
-    except FileNotFoundError:  # pragma: no cover
-        subprocess.run(
-            ["pdm", "install"],
-            cwd=project_path,
-            check=True,
-            timeout=300,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            env={**os.environ, "PDM_CONFIG_use_uv": "false"},
-        )
-    except subprocess.CalledProcessError as e:
-        print("\n--- [Inner PDM Install STDOUT] ---")
-        print(e.stdout)
-        print("--- [Inner PDM Install STDERR] ---")
-        print(e.stderr)
-        print("-------------------------------------------\n")
-        raise
+    # --- Install Dependencies (Always PDM, unless using cached venvs) ---
+    if request.config.getoption("--offline-venvs"):
+        provision_venv(project_path)
+    else:
+        install_with_pdm(project_path)
 
     # --- Run Bandit Check ---
     bandit_command = get_run_command(task_runner, ["bandit-check"])
@@ -317,12 +344,47 @@ def test_generated_project_with_bandit(
         raise
 
 
+def test_generated_cli_entry_point(
+    template_path: str,
+    tmp_path: Path,
+    common_data: dict[str, str],
+    request: pytest.FixtureRequest,
+    provision_venv: Callable[[Path], None],
+) -> None:
+    """
+    Generate a project with the CLI and run it through its console script.
+    """
+    data = {**common_data, "cli": True}
+    run_copy(
+        template_path, tmp_path, data=data, defaults=True, skip_tasks=True, unsafe=True
+    )
+    project_path = tmp_path / common_data["project_slug"]
+
+    if request.config.getoption("--offline-venvs"):
+        provision_venv(project_path)
+    else:
+        install_with_pdm(project_path)
+
+    script = project_path / ".venv" / "bin" / common_data["project_slug"]
+    if os.name == "nt":  # pragma: no cover
+        script = project_path / ".venv" / "Scripts" / f"{common_data['project_slug']}.exe"
+    result = subprocess.run(
+        [script, "hello", "Venv"],
+        cwd=project_path,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "Hello, Venv!" in result.stdout
+
+
 # @pytest.mark.skip(
 #     reason="The 'safety' package does not yet support Python 3.13. Re-enable when it
 #             does."
 # )
 def test_generated_project_with_safety(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    template_path: str, tmp_path: Path, common_data: dict[str, str]
 ) -> None:
     """
     Generate a project with safety and run its security check.
@@ -345,10 +407,9 @@ def test_generated_project_with_safety(
             shutil.rmtree(destination_path, onerror=force_rmtree_onerror)
 
         run_copy(
-            root_path,
+            template_path,
             destination_path,
             data=data,
-            vcs_ref="HEAD",
             defaults=True,
             skip_tasks=True,
             unsafe=True,
@@ -428,7 +489,7 @@ def test_generated_project_with_safety(
 
 
 def test_with_dependabot_automerge(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
     """
     Tests that the dependabot.yml file is correctly generated with automerge.
@@ -439,18 +500,7 @@ def test_with_dependabot_automerge(
         "use_dependabot": True,
         "dependabot_automerge": True,
     }
-    destination_path = tmp_path / "dependabot_automerge_true"
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     dependabot_file = project_path / ".github" / "dependabot.yml"
     assert dependabot_file.is_file()
     with open(dependabot_file) as f:
@@ -462,24 +512,13 @@ def test_with_dependabot_automerge(
         **common_data,
         "use_dependabot": False,
     }
-    destination_path = tmp_path / "dependabot_automerge_false"
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     dependabot_file = project_path / ".github" / "dependabot.yml"
     assert not dependabot_file.exists()
 
 
 def test_with_env_file(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
     """
     Tests that the .env file is correctly generated.
@@ -489,18 +528,7 @@ def test_with_env_file(
         **common_data,
         "generate_env": True,
     }
-    destination_path = tmp_path / "env_file_true"
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     env_file = project_path / ".env"
     assert env_file.is_file()
 
@@ -509,24 +537,13 @@ def test_with_env_file(
         **common_data,
         "generate_env": False,
     }
-    destination_path = tmp_path / "env_file_false"
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     env_file = project_path / ".env"
     assert not env_file.exists()
 
 
 def test_with_adr_support(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
     """
     Tests that the ADR files are correctly generated.
@@ -536,18 +553,7 @@ def test_with_adr_support(
         **common_data,
         "include_adr": True,
     }
-    destination_path = tmp_path / "adr_support_true"
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     adr_script = project_path / "scripts" / "new_adr.py"
     adr_template = project_path / "docs" / "adr" / "0000-template.md"
     assert adr_script.is_file()
@@ -558,18 +564,7 @@ def test_with_adr_support(
         **common_data,
         "include_adr": False,
     }
-    destination_path = tmp_path / "adr_support_false"
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     adr_script_path = project_path / "scripts"
     adr_script_file = adr_script_path / "new_adr.py"
     adr_docs_path = project_path / "docs" / "adr"
@@ -578,7 +573,7 @@ def test_with_adr_support(
 
 
 def test_with_polish_files(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
     """
     Tests that the repository polish files are correctly generated.
@@ -590,18 +585,7 @@ def test_with_polish_files(
         "add_security_md": True,
         "add_citation_cff": True,
     }
-    destination_path = tmp_path / "polish_files_true"
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     coc_file = project_path / "CODE_OF_CONDUCT.md"
     security_file = project_path / "SECURITY.md"
     citation_file = project_path / "CITATION.cff"
@@ -616,18 +600,7 @@ def test_with_polish_files(
         "add_security_md": False,
         "add_citation_cff": False,
     }
-    destination_path = tmp_path / "polish_files_false"
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     coc_file = project_path / "CODE_OF_CONDUCT.md"
     security_file = project_path / "SECURITY.md"
     citation_file = project_path / "CITATION.cff"
@@ -0,0 +1,80 @@
+"""
+Compare each answer profile's render with its golden manifest in tests/golden/.
+
+After an intended template change, refresh the manifests and review their diff:
+
+    pytest tests/test_golden.py --update-golden
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+from answer_profiles import PROFILES, profile_answers
+from copier import run_copy
+from golden_manifest import (
+    build_manifest,
+    describe_changes,
+    load_manifest,
+    write_manifest,
+)
+from template_snapshot import snapshot_template
+
+GOLDEN_DIR = Path(__file__).with_name("golden")
+
+RenderProject = Callable[[dict[str, Any]], Path]
+
+
+def render_committed(root_path: str, data: dict[str, Any], destination: Path) -> Path:
+    """Render the template as committed at HEAD, to diff a failing render against."""
+    template = snapshot_template(
+        Path(root_path), destination / "template", committed_only=True
+    )
+    run_copy(
+        str(template),
+        destination / "render",
+        data=data,
+        defaults=True,
+        skip_tasks=True,
+        unsafe=True,
+        quiet=True,
+    )
+    return destination / "render" / str(data["project_slug"])
+
+
+@pytest.mark.parametrize("profile", list(PROFILES))
+def test_render_matches_golden_manifest(
+    profile: str,
+    render_project: RenderProject,
+    root_path: str,
+    tmp_path: Path,
+    request: pytest.FixtureRequest,
+) -> None:
+    data = profile_answers(profile)
+    project_path = render_project(data)
+    manifest = {"profile": profile, **build_manifest(project_path)}
+    golden_path = GOLDEN_DIR / f"{profile}.json"
+
+    if request.config.getoption("--update-golden"):
+        write_manifest(golden_path, manifest)
+        return
+    golden = load_manifest(golden_path)
+    if golden is None:
+        pytest.fail(f"{golden_path} is missing: run pytest with --update-golden")
+    if golden == manifest:
+        return
+
+    # Diff file contents against HEAD when HEAD still renders the golden tree.
+    committed_path = render_committed(root_path, data, tmp_path)
+    reference_path: Path | None = committed_path
+    if build_manifest(committed_path) != {
+        key: golden[key] for key in ("files", "fields")
+    }:
+        reference_path = None
+    pytest.fail(
+        f"The '{profile}' render differs from {golden_path.name}:\n"
+        + describe_changes(golden, manifest, project_path, reference_path)
+        + "\nIf this is intended, run pytest with --update-golden.",
+        pytrace=False,
+    )
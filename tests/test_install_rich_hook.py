@@ -0,0 +1,85 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+from install_rich_hook import (
+    LEGACY_HOOK,
+    hook_files,
+    install,
+    is_installed,
+    legacy_hook,
+    uninstall,
+)
+from venvs import make_venv
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "install_rich_hook.py"
+
+
+@pytest.fixture
+def venv_python(tmp_path: Path) -> Path:
+    python = make_venv(tmp_path / "venv")
+    subprocess.run([python, SCRIPT, "install"], check=True, capture_output=True)
+    return python
+
+
+def test_install_replaces_the_legacy_hook(tmp_path: Path) -> None:
+    sitecustomize = tmp_path / "sitecustomize.py"
+    sitecustomize.write_text(LEGACY_HOOK)
+    assert legacy_hook(tmp_path) == sitecustomize
+
+    install(tmp_path)
+    assert is_installed(tmp_path)
+    assert not sitecustomize.exists()
+
+    assert uninstall(tmp_path) == hook_files(tmp_path)
+    assert not is_installed(tmp_path)
+    assert uninstall(tmp_path) == []
+
+
+def test_uninstall_keeps_other_sitecustomize(tmp_path: Path) -> None:
+    sitecustomize = tmp_path / "sitecustomize.py"
+    sitecustomize.write_text("import os\n")
+    install(tmp_path)
+    uninstall(tmp_path)
+    assert sitecustomize.read_text() == "import os\n"
+
+
+def test_startup_does_not_import_rich(venv_python: Path) -> None:
+    """The hook is installed at startup, but rich is not imported."""
+    result = subprocess.run(
+        [
+            venv_python,
+            "-c",
+            "import sys; print('rich' in sys.modules, sys.excepthook.__module__)",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert result.stdout.split() == ["False", "_rich_traceback_hook"]
+
+
+def test_uncaught_exception_is_shown_with_rich(venv_python: Path) -> None:
+    result = subprocess.run(
+        [venv_python, "-c", "raise ValueError('boom')"], capture_output=True, text=True
+    )
+    assert result.returncode == 1
+    assert "Traceback (most recent call last)" in result.stderr
+    assert "ValueError: boom" in result.stderr
+    # rich draws the traceback in a panel.
+    assert "╭" in result.stderr
+
+
+def test_status_and_uninstall_commands(venv_python: Path) -> None:
+    status = subprocess.run(
+        [venv_python, SCRIPT, "status"], capture_output=True, text=True
+    )
+    assert status.returncode == 0
+    assert "rich traceback hook: installed" in status.stdout
+
+    subprocess.run([venv_python, SCRIPT, "uninstall"], check=True, capture_output=True)
+    status = subprocess.run(
+        [venv_python, SCRIPT, "status"], capture_output=True, text=True
+    )
+    assert status.returncode == 1
+    assert "rich traceback hook: not installed" in status.stdout
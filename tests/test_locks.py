@@ -0,0 +1,104 @@
+"""Tests for the pre-resolved locks in template/locks/."""
+
+import importlib.util
+import subprocess
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+from answer_matrix import load_questions
+from answer_profiles import profile_answers
+from copier import run_copy
+from extensions.context import dependency_profile, lock_key
+from template_snapshot import snapshot_template
+from update_locks import (
+    dependency_profiles,
+    named_profiles,
+    shipped_locks,
+    stale_locks,
+)
+
+RenderProject = Callable[[dict[str, Any]], Path]
+
+
+def full_answers(profile: str, **answers: Any) -> dict[str, Any]:
+    """A profile's answers with copier.yaml's defaults for everything else."""
+    defaults = {question.name: question.choices[0] for question in load_questions()}
+    return {**defaults, **profile_answers(profile), **answers}
+
+
+def test_no_lock_is_stale() -> None:
+    stale = stale_locks(dependency_profiles())
+    assert not stale, (
+        f"{len(stale)} locks match no dependency profile any more: "
+        "run python scripts/update_locks.py"
+    )
+
+
+def test_named_profiles_have_locks() -> None:
+    """Without shipped locks, the lock tests below have nothing to check."""
+    missing = sorted(named_profiles().keys() - shipped_locks().keys())
+    assert shipped_locks(), "template/locks/ has no locks"
+    assert not missing, (
+        f"{len(missing)} answer profiles have no lock: "
+        "run python scripts/update_locks.py --named"
+    )
+
+
+def test_profiles_ignore_answers_that_do_not_change_dependencies() -> None:
+    answers = full_answers("defaults")
+    profile = dependency_profile(answers)
+    assert dependency_profile({**answers, "include_adr": True}) == profile
+    assert dependency_profile({**answers, "cli": True}) != profile
+    # Without docs, whether mkdocstrings would have been wanted is irrelevant.
+    no_docs = {**answers, "use_docs": False}
+    assert dependency_profile({**no_docs, "use_mkdocstrings": False}) == (
+        dependency_profile(no_docs)
+    )
+
+
+@pytest.mark.parametrize(("installer", "shipped"), [("pdm", True), ("uv", False)])
+def test_matching_lock_is_dropped_in(
+    installer: str, shipped: bool, root_path: str, tmp_path: Path
+) -> None:
+    template = snapshot_template(Path(root_path), tmp_path / "template")
+    data = {**profile_answers("defaults"), "installer": installer}
+    key = lock_key(dependency_profile(full_answers("defaults")))
+    lock = '[metadata]\ncontent_hash = "sha256:0"\n'
+    (template / "template" / "locks" / f"{key}.pdm.lock").write_text(lock)
+
+    run_copy(
+        str(template),
+        tmp_path / "render",
+        data=data,
+        defaults=True,
+        skip_tasks=True,
+        unsafe=True,
+        quiet=True,
+    )
+
+    assert not (tmp_path / "render" / "locks").exists()
+    project_path = tmp_path / "render" / data["project_slug"]
+    if shipped:
+        assert (project_path / "pdm.lock").read_text() == lock
+    else:
+        assert not (project_path / "pdm.lock").exists()
+
+
+@pytest.mark.skipif(importlib.util.find_spec("pdm") is None, reason="needs pdm")
+@pytest.mark.parametrize("key", sorted(shipped_locks()))
+def test_shipped_lock_matches_its_pyproject(
+    key: str, render_project: RenderProject
+) -> None:
+    """`pdm lock --check` fails when pyproject.toml changed since locking."""
+    answers = dependency_profiles()[key]
+    project_path = render_project({**profile_answers("defaults"), **answers})
+    result = subprocess.run(
+        [sys.executable, "-m", "pdm", "lock", "--check"],
+        cwd=project_path,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
@@ -1,21 +1,14 @@
+import shutil
 import tomllib
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
-from copier import run_copy
+RenderProject = Callable[[dict[str, Any]], Path]
 
 
-def test_defaults(root_path: str, tmp_path: Path, common_data: dict[str, str]) -> None:
-    destination_path = tmp_path / "generated_project"
-    run_copy(
-        root_path,
-        destination_path,
-        data=common_data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+def test_defaults(render_project: RenderProject, common_data: dict[str, str]) -> None:
+    project_path = render_project(common_data)
     assert (project_path / "pyproject.toml").exists()
     assert (project_path / "README.md").exists()
     assert (project_path / "src" / "test_project").exists()
@@ -24,8 +17,8 @@ def test_defaults(root_path: str, tmp_path: Path, common_data: dict[str, str]) -
     assert (project_path / "tests").exists()
     assert (project_path / "src" / "test_project" / "py.typed").exists()
 
-    # assert settings.py exists
-    assert (project_path / "src" / "test_project" / "settings.py").exists()
+    # settings.py holds the pydantic-settings Settings, which only that library uses
+    assert not (project_path / "src" / "test_project" / "settings.py").exists()
 
     # parse pyproject.toml to check for dependencies
     content = (project_path / "pyproject.toml").read_text()
@@ -72,10 +65,9 @@ def test_defaults(root_path: str, tmp_path: Path, common_data: dict[str, str]) -
 
 
 def test_task_runner_pdm(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
     """Verify pdm scripts are generated and justfile is absent when task_runner is pdm."""
-    destination_path = tmp_path / "generated_project_pdm"
     data = {
         **common_data,
         "task_runner": "pdm",
@@ -83,16 +75,7 @@ def test_task_runner_pdm(
         "use_bandit": False,  # Ensure bandit is off
         "doc_hosting_provider": "None",  # Ensure docs RTD is off
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,  # Allow defaults for unspecified vars
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
 
     # Assert justfile is NOT created
     assert not (project_path / "justfile").exists()
@@ -109,6 +92,8 @@ def test_task_runner_pdm(
     # Check for core scripts
     assert "lint" in pdm_scripts
     assert "test" in pdm_scripts
+    assert "test-fast" in pdm_scripts
+    assert "test-full" in pdm_scripts
     assert "format" in pdm_scripts
     assert "type-check" in pdm_scripts
     assert "qa" in pdm_scripts  # Check the composite script exists
@@ -132,27 +117,17 @@ def test_task_runner_pdm(
 
 
 def test_task_runner_just(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
     """Verify justfile is generated and pdm scripts are absent when task_runner is
     just."""
-    destination_path = tmp_path / "generated_project_just"
     data = {
         **common_data,
         "task_runner": "just",
         "use_safety": False,
         "use_bandit": False,
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,  # Allow defaults for unspecified vars
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
 
     # Assert justfile IS created
     justfile_path = project_path / "justfile"
@@ -171,6 +146,8 @@ def test_task_runner_just(
     # Check for core script definitions in justfile (simple string checks)
     assert "lint *args:" in justfile_content
     assert "test *args:" in justfile_content
+    assert "test-fast *args:" in justfile_content
+    assert "test-full *args:" in justfile_content
     assert "format *args:" in justfile_content
     assert "type-check *args:" in justfile_content
     assert "qa:" in justfile_content  # Composite scripts end with a colon
@@ -197,27 +174,53 @@ def test_task_runner_just(
     assert "@just bandit-check" not in justfile_content
 
 
+def test_fast_and_full_test_tasks(
+    render_project: RenderProject, common_data: dict[str, str]
+) -> None:
+    """Verify test-fast and test-full run the same commands under pdm and just."""
+    pdm_path = render_project({**common_data, "task_runner": "pdm"})
+    pyproject = tomllib.loads((pdm_path / "pyproject.toml").read_text())
+    pdm_scripts = pyproject["tool"]["pdm"]["scripts"]
+    fast = pdm_scripts["test-fast"]["cmd"]
+    full = pdm_scripts["test-full"]["cmd"]
+    assert "-n auto" in fast and "--no-cov" in fast
+    assert "-m 'not slow and not integration and not network'" in fast
+    assert "-n auto" in full and "--no-cov" not in full
+    assert any(
+        dep.startswith("pytest-xdist")
+        for dep in pyproject["tool"]["pdm"]["dev-dependencies"]["dev"]
+    )
+    # Coverage stays on for plain pytest runs and test-full.
+    assert "--cov=" in pyproject["tool"]["pytest"]["ini_options"]["addopts"]
+
+    just_path = render_project({**common_data, "task_runner": "just"})
+    justfile_content = (just_path / "justfile").read_text()
+    assert f"    @{fast} {{{{ args }}}}" in justfile_content
+    assert f"    @{full} {{{{ args }}}}" in justfile_content
+
+
+def test_declared_markers(
+    render_project: RenderProject, common_data: dict[str, str]
+) -> None:
+    """Verify the selected markers are declared as "name: description"."""
+    data = {**common_data, "pytest_markers": ["unit", "slow"]}
+    project_path = render_project(data)
+    pyproject = tomllib.loads((project_path / "pyproject.toml").read_text())
+    markers = pyproject["tool"]["pytest"]["ini_options"]["markers"]
+    assert [marker.split(":")[0] for marker in markers] == ["unit", "slow"]
+
+
 def test_conditional_scripts_pdm(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
     """Verify optional scripts (e.g., safety) appear in pdm config when enabled."""
-    destination_path = tmp_path / "generated_project_pdm_safety"
     data = {
         **common_data,
         "task_runner": "pdm",
         "use_safety": True,  # Enable safety
         "use_bandit": False,  # Keep bandit off
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     content = (project_path / "pyproject.toml").read_text()
     toml_data = tomllib.loads(content)
     pdm_scripts = toml_data.get("tool", {}).get("pdm", {}).get("scripts", {})
@@ -232,26 +235,16 @@ def test_conditional_scripts_pdm(
 
 
 def test_conditional_scripts_just(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
     """Verify optional scripts (e.g., safety) appear in justfile when enabled."""
-    destination_path = tmp_path / "generated_project_just_safety"
     data = {
         **common_data,
         "task_runner": "just",
         "use_safety": True,  # Enable safety
         "use_bandit": False,  # Keep bandit off
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     justfile_content = (project_path / "justfile").read_text()
 
     assert "safety-check *args:" in justfile_content  # Should now be present
@@ -266,22 +259,14 @@ def test_conditional_scripts_just(
     assert "@just bandit-check" not in justfile_content
 
 
-def test_with_cli(root_path: str, tmp_path: Path, common_data: dict[str, str]) -> None:
-    destination_path = tmp_path / "generated_project"
+def test_with_cli(
+    render_project: RenderProject, tmp_path: Path, common_data: dict[str, str]
+) -> None:
     data = {
         **common_data,
         "cli": True,
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     assert Path(project_path / "pyproject.toml").exists()
 
     # Parse pyproject.toml to check for CLI dependencies and scripts
@@ -306,6 +291,8 @@ def test_with_cli(root_path: str, tmp_path: Path, common_data: dict[str, str]) -
     assert (project_path / "src" / "test_project" / "cli").exists()
     assert (project_path / "src" / "test_project" / "cli" / "__main__.py").exists()
 
+    # The cached render is shared, so work on a private copy before writing to it.
+    project_path = Path(shutil.copytree(project_path, tmp_path / project_path.name))
     (project_path / "tests" / "cli").mkdir(parents=True)
     (project_path / "tests" / "cli" / "test_cli.py").write_text(
         """from typer.testing import CliRunner
@@ -322,42 +309,22 @@ def test_hello():
     )
 
 
-def test_with_docker(root_path: str, tmp_path: Path, common_data: dict[str, str]) -> None:
-    destination_path = tmp_path / "generated_project"
+def test_with_docker(render_project: RenderProject, common_data: dict[str, str]) -> None:
     data = {
         **common_data,
         "docker_support": True,
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     assert (project_path / "docker-compose.yml").exists()
 
 
-def test_with_badges(root_path: str, tmp_path: Path, common_data: dict[str, str]) -> None:
-    destination_path = tmp_path / "generated_project"
+def test_with_badges(render_project: RenderProject, common_data: dict[str, str]) -> None:
     data = {
         **common_data,
         "badges": True,
         "use_codecov": True,
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     readme_content = (project_path / "README.md").read_text()
     assert "Build Status" in readme_content
     assert "Code Coverage" in readme_content
@@ -365,118 +332,69 @@ def test_with_badges(root_path: str, tmp_path: Path, common_data: dict[str, str]
 
 
 def test_with_env_file(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
-    destination_path = tmp_path / "generated_project"
     data = {
         **common_data,
         "generate_env": True,
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     assert (project_path / ".env").exists()
 
 
 def test_license_proprietary(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
-    destination_path = tmp_path / "generated_project"
     data = {
         **common_data,
         "license": "Proprietary",
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     license_content = (project_path / "LICENSE.md").read_text()
     assert "All Rights Reserved." in license_content
 
 
 def test_license_apache(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
-    destination_path = tmp_path / "generated_project"
     data = {
         **common_data,
         "license": "Apache-2.0",
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     assert (project_path / "LICENSE.md").exists()
     license_content = (project_path / "LICENSE.md").read_text()
     assert "Apache License" in license_content
 
 
 def test_different_python_version(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
-    destination_path = tmp_path / "generated_project"
     data = {
         **common_data,
         "python_version": "3.12",
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     pyproject_content = (project_path / "pyproject.toml").read_text()
     toml_data = tomllib.loads(pyproject_content)
     assert toml_data.get("project", {}).get("requires-python") == ">=3.12"
 
 
 def test_with_typed_settings(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
     """Verify that the typed-settings config is generated correctly."""
-    destination_path = tmp_path / "generated_project_typed_settings"
     data = {
         **common_data,
         "config_library": "typed-settings",
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,  # Allow defaults for unspecified vars
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     module_path_str = common_data["module_name"]
 
     # 1. Check that config.py exists
     config_file_path = project_path / "src" / module_path_str / "config.py"
     assert config_file_path.exists()
+    assert not (project_path / "src" / module_path_str / "settings.py").exists()
 
     # 2. Check that the content is correct for typed-settings
     config_content = config_file_path.read_text()
@@ -499,25 +417,36 @@ def test_with_typed_settings(
     assert "pydantic-settings" not in main_deps
 
 
-def test_with_codecov(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+def test_with_pydantic_settings(
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
+    """Verify that config.py re-exports the pydantic-settings accessors."""
+    data = {
+        **common_data,
+        "config_library": "pydantic-settings",
+    }
+    project_path = render_project(data)
+    module_path = project_path / "src" / common_data["module_name"]
+
+    config_content = (module_path / "config.py").read_text()
+    assert "from .settings import Settings, get_settings" in config_content
+    settings_content = (module_path / "settings.py").read_text()
+    assert "from dotenv import" not in settings_content
+    assert (project_path / "tests" / "test_settings.py").exists()
+
+    toml_data = tomllib.loads((project_path / "pyproject.toml").read_text())
+    main_deps = toml_data.get("project", {}).get("dependencies", [])
+    assert "pydantic-settings" in main_deps
+    assert "typed-settings" not in main_deps
+
+
+def test_with_codecov(render_project: RenderProject, common_data: dict[str, str]) -> None:
     """Verify that the Codecov upload step is added to the CI workflow."""
-    destination_path = tmp_path / "generated_project_codecov"
     data = {
         **common_data,
         "use_codecov": True,
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,  # Allow defaults for unspecified vars
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
 
     # 1. Check that the main CI workflow file exists
     ci_workflow_path = project_path / ".github" / "workflows" / "main.yaml"
@@ -529,26 +458,48 @@ def test_with_codecov(
     assert "secrets.CODECOV_TOKEN" in ci_workflow_content
 
 
+def test_with_benchmarks(
+    render_project: RenderProject, common_data: dict[str, str]
+) -> None:
+    """Verify that the benchmarks, their tasks and pytest-benchmark are added."""
+    project_path = render_project({**common_data, "use_benchmarks": True})
+
+    assert (project_path / "tests" / "benchmarks" / "test_benchmarks.py").exists()
+    assert (project_path / "scripts" / "bench_compare.py").exists()
+
+    pyproject = tomllib.loads((project_path / "pyproject.toml").read_text())
+    assert any(
+        dep.startswith("pytest-benchmark")
+        for dep in pyproject["tool"]["pdm"]["dev-dependencies"]["dev"]
+    )
+    pdm_scripts = pyproject["tool"]["pdm"]["scripts"]
+    assert "--benchmark-only" in pdm_scripts["bench"]["cmd"]
+    assert pdm_scripts["bench-compare"]["cmd"] == "python scripts/bench_compare.py"
+    assert "--benchmark-disable" in pyproject["tool"]["pytest"]["ini_options"]["addopts"]
+
+
+def test_without_benchmarks(
+    render_project: RenderProject, common_data: dict[str, str]
+) -> None:
+    """Verify that nothing benchmark-related is generated by default."""
+    project_path = render_project(common_data)
+
+    assert not (project_path / "tests" / "benchmarks").exists()
+    assert not (project_path / "scripts" / "bench_compare.py").exists()
+    pyproject = (project_path / "pyproject.toml").read_text()
+    assert "benchmark" not in pyproject
+
+
 def test_with_detect_secrets(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
     """Verify that the detect-secrets hook is added to pre-commit config."""
-    destination_path = tmp_path / "generated_project_detect_secrets"
     data = {
         **common_data,
         "precommit_install": True,
         "use_detect_secrets": True,
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
 
     # 1. Check that the pre-commit config file exists
     pre_commit_path = project_path / ".pre-commit-config.yaml"
@@ -564,84 +515,44 @@ def test_with_detect_secrets(
 
 
 def test_task_tracking(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
     """Verify that the task tracking files are generated correctly."""
     # Test with TODO.md
-    destination_path = tmp_path / "generated_project_todo"
     data = {
         **common_data,
         "task_tracking": "TODO.md",
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     assert (project_path / "TODO.md").exists()
 
     # Test with GitHub Projects
-    destination_path = tmp_path / "generated_project_github_projects"
     data = {
         **common_data,
         "task_tracking": "GitHub Projects",
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     assert not (project_path / "TODO.md").exists()
 
     # Test with None
-    destination_path = tmp_path / "generated_project_no_task_tracking"
     data = {
         **common_data,
         "task_tracking": "None",
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     assert not (project_path / "TODO.md").exists()
 
 
 def test_with_semantic_release(
-    root_path: str, tmp_path: Path, common_data: dict[str, str]
+    render_project: RenderProject, common_data: dict[str, str]
 ) -> None:
     """Verify that the semantic-release files are generated correctly."""
     # Test with semantic-release enabled
-    destination_path = tmp_path / "generated_project_semantic_release"
     data = {
         **common_data,
         "use_semantic_release": True,
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     assert (project_path / ".github" / "workflows" / "release.yaml").exists()
     content = (project_path / "pyproject.toml").read_text()
     toml_data = tomllib.loads(content)
@@ -652,21 +563,11 @@ def test_with_semantic_release(
     assert "python-semantic-release" in dev_deps
 
     # Test with semantic-release disabled
-    destination_path = tmp_path / "generated_project_no_semantic_release"
     data = {
         **common_data,
         "use_semantic_release": False,
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     assert not (project_path / ".github" / "workflows" / "release.yaml").exists()
     content = (project_path / "pyproject.toml").read_text()
     toml_data = tomllib.loads(content)
@@ -677,47 +578,27 @@ def test_with_semantic_release(
     assert "python-semantic-release" not in dev_deps
 
 
-def test_with_docs(root_path: str, tmp_path: Path, common_data: dict[str, str]) -> None:
+def test_with_docs(render_project: RenderProject, common_data: dict[str, str]) -> None:
     """Verify that the documentation files are generated correctly."""
     # Test with docs enabled
-    destination_path = tmp_path / "generated_project_docs"
     data = {
         **common_data,
         "use_docs": True,
         "use_mkdocstrings": True,
         "doc_hosting_provider": "Read the Docs",
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     assert (project_path / "docs").exists()
     assert (project_path / "mkdocs.yml").exists()
     assert (project_path / "docs" / "api.md").exists()
     assert (project_path / ".github" / "workflows" / "docs.yaml").exists()
 
     # Test with docs disabled
-    destination_path = tmp_path / "generated_project_no_docs"
     data = {
         **common_data,
         "use_docs": False,
     }
-    run_copy(
-        root_path,
-        destination_path,
-        data=data,
-        vcs_ref="HEAD",
-        defaults=True,
-        skip_tasks=True,
-        unsafe=True,
-    )
-    project_path = destination_path / common_data["project_slug"]
+    project_path = render_project(data)
     assert not (project_path / "docs").exists()
     assert not (project_path / "mkdocs.yml").exists()
     assert not (project_path / ".github" / "workflows" / "docs.yaml").exists()
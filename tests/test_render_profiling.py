@@ -0,0 +1,142 @@
+import dataclasses
+import gc
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import copier._main
+import copier._user_data
+import pytest
+from copier import run_copy
+from extensions.profiling import ENV_VAR, PHASE_BY_FUNCTION, RenderProfiler, summarize
+from jinja2 import Environment
+
+
+def test_profile_reports_phases_and_files(
+    template_path: str,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    common_data: dict[str, str],
+) -> None:
+    """With COPIER_PROFILE set, a render writes a JSON report and a Chrome trace."""
+    profile_dir = tmp_path / "profile"
+    monkeypatch.setenv(ENV_VAR, str(profile_dir))
+    run_copy(
+        template_path,
+        tmp_path / "out",
+        data=common_data,
+        defaults=True,
+        skip_tasks=True,
+        unsafe=True,
+        quiet=True,
+    )
+    gc.collect()
+
+    (report_path,) = [
+        path
+        for path in profile_dir.glob("render-*.json")
+        if not path.name.endswith(".trace.json")
+    ]
+    report = json.loads(report_path.read_text())
+    phases = {entry["phase"] for entry in report["phases"]}
+    assert {"questions", "exclude", "paths", "files"} <= phases
+    seconds = [entry["seconds"] for entry in report["items"]]
+    assert seconds == sorted(seconds, reverse=True)
+    files = {entry["name"] for entry in report["items"] if entry["phase"] == "files"}
+    assert "template/{{ project_slug }}/pyproject.toml.jinja" in files
+
+    trace = json.loads(report_path.with_suffix(".trace.json").read_text())
+    assert trace["traceEvents"]
+    assert all(event["ph"] == "X" for event in trace["traceEvents"])
+
+    summary = summarize(profile_dir)
+    assert summary["reports"] == 1
+    assert summary["phases"][0]["seconds"] >= summary["phases"][-1]["seconds"]
+
+
+def test_profiling_is_off_by_default(
+    template_path: str,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    common_data: dict[str, str],
+) -> None:
+    """Without COPIER_PROFILE nothing is instrumented or written."""
+    monkeypatch.delenv(ENV_VAR, raising=False)
+    monkeypatch.chdir(tmp_path)
+    run_copy(
+        template_path,
+        tmp_path / "out",
+        data=common_data,
+        defaults=True,
+        skip_tasks=True,
+        unsafe=True,
+        quiet=True,
+    )
+    gc.collect()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["out"]
+
+
+def test_report_is_written_once_and_environment_is_untouched(
+    template_path: str,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    common_data: dict[str, str],
+    capfd: pytest.CaptureFixture[str],
+) -> None:
+    """
+    The report is written when the run ends, not after every file, and the
+    profile directory reaches the bootstrap task as --profile-dir, not through
+    os.environ.
+    """
+    # copier loads the extension as its own module, so count at the Path level.
+    writes: list[str] = []
+    write_text = Path.write_text
+
+    def counting_write_text(path: Path, *args: Any, **kwargs: Any) -> int:
+        if path.name.startswith("render-"):
+            writes.append(path.name)
+        return write_text(path, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "write_text", counting_write_text)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(ENV_VAR, "profile")
+    run_copy(
+        template_path,
+        tmp_path / "out",
+        data=common_data,
+        defaults=True,
+        unsafe=True,
+        pretend=True,
+    )
+    gc.collect()
+
+    assert os.environ[ENV_VAR] == "profile"
+    # The JSON report and the trace, once each.
+    assert len(writes) == 2
+    assert f"python bootstrap.py --profile-dir {tmp_path / 'profile'}" in (
+        capfd.readouterr().err
+    )
+
+
+def test_copier_still_has_the_functions_phases_are_read_from() -> None:
+    """Fails when a copier upgrade renames what the profiler walks the stack for."""
+    worker_attributes = set(dir(copier._main.Worker))
+    assert {*PHASE_BY_FUNCTION, "jinja_env"} <= worker_attributes
+    assert copier._user_data.__file__.endswith("_user_data.py")
+    fields = {field.name for field in dataclasses.fields(copier._user_data.Question)}
+    assert "var_name" in fields
+
+
+def test_warns_when_no_render_matches_a_copier_phase(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Outside copier every render is "other", as after copier renamed its functions."""
+    monkeypatch.setenv(ENV_VAR, str(tmp_path))
+    environment = Environment(extensions=[RenderProfiler])
+    assert environment.from_string("{{ 1 + 1 }}").render() == "2"
+    with pytest.warns(RuntimeWarning, match="PHASE_BY_FUNCTION"):
+        del environment
+        gc.collect()
+    (report_path,) = tmp_path.glob("render-*[0-9].json")
+    assert json.loads(report_path.read_text())["phases"][0]["phase"] == "other"
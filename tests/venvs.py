@@ -0,0 +1,27 @@
+"""Throwaway virtual environments for the tests and benchmarks of scripts/."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+
+def make_venv(path: Path) -> Path:
+    """A venv that sees this interpreter's packages (rich among them); its python."""
+    subprocess.run(
+        [sys.executable, "-m", "venv", "--without-pip", "--system-site-packages", path],
+        check=True,
+    )
+    if sys.platform == "win32":
+        return path / "Scripts" / "python.exe"
+    return path / "bin" / "python"
+
+
+def site_packages(python: Path) -> Path:
+    """The site-packages directory of a venv, as its own interpreter reports it."""
+    result = subprocess.run(
+        [python, "-c", "import sysconfig; print(sysconfig.get_path('purelib'))"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return Path(result.stdout.strip())